@@ -5,9 +5,15 @@
 使用 AI Agent 模式（Gemini Vision）
 AI 配置请在「配置管理 → 全局设置」中设置
 """
+import re
 import sys
 import asyncio
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 
 from PyQt6.QtWidgets import (
     QDialog,
@@ -25,7 +31,7 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QAbstractItemView,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QColor, QBrush
 
 from ix_api import get_group_list
@@ -34,10 +40,29 @@ from database import DBManager
 from core.config_manager import ConfigManager
 from auto_bind_card_ai import auto_bind_card_ai
 
+# 不可显示字符（控制字符、格式字符、非空格分隔符），用于清理分组名称
+_NON_PRINTABLE_RE = re.compile(r'[\x00-\x1f\x7f-\xa0\xad\u2000-\u200f\u2028-\u202f\u205f-\u2064\u3000\ufeff]+')
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_name(name: str) -> str:
+    """清理名称中的不可显示字符（分组名大量重复，结果缓存）"""
+    return _NON_PRINTABLE_RE.sub('', name)
+
+
+@dataclass(slots=True)
+class AccountJob:
+    """单个绑卡任务（账号 + 分配的卡片）"""
+    browser_id: str
+    email: str
+    password: str
+    secret: str
+    card_info: dict
+
 
 class BindCardAIWorker(QThread):
     """后台工作线程"""
-    progress_signal = pyqtSignal(str, str, str, str)  # browser_id, status, message, card_number
+    progress_signal = pyqtSignal(object)  # {browser_id: (status, message, card_number)}
     finished_signal = pyqtSignal()
     log_signal = pyqtSignal(str)
 
@@ -58,21 +83,61 @@ class BindCardAIWorker(QThread):
         self.close_after = close_after
         self.ai_config = ai_config or {}
         self.is_running = True
+        self._loop = None
+        self._main_task = None
+        self._pending_updates = {}  # 待发送的进度更新，同一窗口只保留最新状态
 
     def stop(self):
         self.is_running = False
+        # 取消主任务，让正在进行的绑卡协程立即收到 CancelledError
+        loop, task = self._loop, self._main_task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # 事件循环已关闭
 
     def _log(self, message: str):
         self.log_signal.emit(message)
 
+    def _emit_progress(self, browser_id: str, status: str, message: str, card_number: str):
+        """缓冲进度更新，由 _progress_flusher 定时批量发送"""
+        self._pending_updates[browser_id] = (status, message, card_number)
+
+    def _flush_progress(self):
+        if self._pending_updates:
+            updates, self._pending_updates = self._pending_updates, {}
+            self.progress_signal.emit(updates)
+
+    async def _progress_flusher(self):
+        while True:
+            await asyncio.sleep(0.1)
+            self._flush_progress()
+
     def run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
         try:
-            asyncio.run(self._process_all())
+            self._main_task = self._loop.create_task(self._process_all())
+            self._loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            self._log("⚠️ 任务已取消")
         except Exception as e:
             self._log(f"❌ 工作线程异常: {e}")
             traceback.print_exc()
         finally:
-            self.finished_signal.emit()
+            try:
+                # 与 asyncio.run 一致：清理残留任务后关闭事件循环
+                pending = asyncio.all_tasks(self._loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            finally:
+                asyncio.set_event_loop(None)
+                self._loop.close()
+                self.finished_signal.emit()
 
     async def _process_all(self):
         if not self.accounts:
@@ -84,88 +149,98 @@ class BindCardAIWorker(QThread):
 
         self._log(f"开始处理 {len(self.accounts)} 个账号，并发数: {self.thread_count}，一卡几绑: {self.cards_per_account}")
 
-        # 使用信号量控制并发
-        semaphore = asyncio.Semaphore(self.thread_count)
+        # 一卡几绑逻辑：第 i 个账号使用第 i // cards_per_account 张卡片
+        capacity = len(self.cards) * self.cards_per_account
+        if len(self.accounts) > capacity:
+            self._log("⚠️ 卡片已用完，停止分配")
+
+        accounts_with_cards = [
+            AccountJob(
+                browser_id=account.get('browser_id', ''),
+                email=account.get('email', ''),
+                password=account.get('password', ''),
+                secret=account.get('secret', ''),
+                card_info=self.cards[i // self.cards_per_account],
+            )
+            for i, account in enumerate(self.accounts[:capacity])
+        ]
+
+        if not accounts_with_cards:
+            self._log("⚠️ 没有可处理的账号（卡片不足或无账号）")
+            return
 
-        # 一卡几绑逻辑：为每个账号预先分配卡片
-        card_index = 0
-        card_usage_count = 0
-        accounts_with_cards = []
+        used_cards = (len(accounts_with_cards) + self.cards_per_account - 1) // self.cards_per_account
+        self._log(f"实际处理 {len(accounts_with_cards)} 个账号（使用 {used_cards} 张卡片）")
 
-        for account in self.accounts:
+        async def process_one(index: int, job: AccountJob):
             if not self.is_running:
-                break
-
-            # 检查是否需要切换到下一张卡片
-            if card_usage_count >= self.cards_per_account:
-                card_index += 1
-                card_usage_count = 0
+                return
 
-            # 检查卡片是否用完
-            if card_index >= len(self.cards):
-                self._log("⚠️ 卡片已用完，停止分配")
-                break
+            browser_id = job.browser_id
+            email = job.email or 'Unknown'
+            card_info = job.card_info
+            card_number = card_info.get('number', '')
+            card_masked = f"****{card_number[-4:]}" if len(card_number) >= 4 else "****"
 
-            card = self.cards[card_index]
-            card_usage_count += 1
+            self._log(f"[{index + 1}] 开始绑卡: {email} ({browser_id}) 卡片: {card_masked}")
+            self._emit_progress(browser_id, "处理中", "正在绑卡...", card_masked)
 
-            # 将卡片信息附加到账号
-            account_with_card = account.copy()
-            account_with_card['card_info'] = card
-            accounts_with_cards.append(account_with_card)
+            try:
+                account_info = {
+                    'email': job.email,
+                    'password': job.password,
+                    'secret': job.secret,
+                }
 
-        if not accounts_with_cards:
-            self._log("⚠️ 没有可处理的账号（卡片不足或无账号）")
-            return
+                success, msg = await auto_bind_card_ai(
+                    browser_id,
+                    account_info,
+                    card_info,
+                    self.close_after,
+                    api_key=self.ai_config.get('api_key'),
+                    base_url=self.ai_config.get('base_url'),
+                    model=self.ai_config.get('model', 'gemini-2.5-flash'),
+                    max_steps=self.ai_config.get('max_steps', 40),
+                )
 
-        self._log(f"实际处理 {len(accounts_with_cards)} 个账号（使用 {card_index + 1} 张卡片）")
-
-        async def process_one(index: int, account: dict):
-            async with semaphore:
-                if not self.is_running:
-                    return
-
-                browser_id = account.get('browser_id', '')
-                email = account.get('email', 'Unknown')
-                card_info = account.get('card_info', {})
-                card_number = card_info.get('number', '')
-                card_masked = f"****{card_number[-4:]}" if len(card_number) >= 4 else "****"
-
-                self._log(f"[{index + 1}] 开始绑卡: {email} ({browser_id}) 卡片: {card_masked}")
-                self.progress_signal.emit(browser_id, "处理中", "正在绑卡...", card_masked)
-
-                try:
-                    account_info = {
-                        'email': account.get('email', ''),
-                        'password': account.get('password', ''),
-                        'secret': account.get('secret', ''),
-                    }
-
-                    success, msg = await auto_bind_card_ai(
-                        browser_id,
-                        account_info,
-                        card_info,
-                        self.close_after,
-                        api_key=self.ai_config.get('api_key'),
-                        base_url=self.ai_config.get('base_url'),
-                        model=self.ai_config.get('model', 'gemini-2.5-flash'),
-                        max_steps=self.ai_config.get('max_steps', 40),
-                    )
-
-                    if success:
-                        self._log(f"[{index + 1}] ✅ {email}: {msg}")
-                        self.progress_signal.emit(browser_id, "成功", msg, card_masked)
-                    else:
-                        self._log(f"[{index + 1}] ❌ {email}: {msg}")
-                        self.progress_signal.emit(browser_id, "失败", msg, card_masked)
-
-                except Exception as e:
-                    self._log(f"[{index + 1}] ❌ {email}: {e}")
-                    self.progress_signal.emit(browser_id, "错误", str(e), card_masked)
-
-        # 并发执行
-        tasks = [process_one(i, acc) for i, acc in enumerate(accounts_with_cards)]
-        await asyncio.gather(*tasks)
+                if success:
+                    # 更新账号状态为 subscribed，并记录绑卡历史（供综合查询使用）
+                    # 在线程池中写库，不阻塞事件循环和 GUI 线程
+                    await asyncio.to_thread(DBManager.mark_bind_card_success, job.email, card_number[-4:] or None)
+                    self._log(f"[{index + 1}] ✅ {email}: {msg}")
+                    self._emit_progress(browser_id, "成功", msg, card_masked)
+                else:
+                    self._log(f"[{index + 1}] ❌ {email}: {msg}")
+                    self._emit_progress(browser_id, "失败", msg, card_masked)
+
+            except asyncio.CancelledError:
+                self._log(f"[{index + 1}] ⚠️ {email}: 已取消")
+                self._emit_progress(browser_id, "已取消", "任务已取消", card_masked)
+                raise
+            except Exception as e:
+                self._log(f"[{index + 1}] ❌ {email}: {e}")
+                self._emit_progress(browser_id, "错误", str(e), card_masked)
+
+        # 任务队列 + 固定数量的 worker 控制并发
+        queue = asyncio.Queue()
+        for item in enumerate(accounts_with_cards):
+            queue.put_nowait(item)
+
+        async def worker():
+            while not queue.empty():
+                index, job = queue.get_nowait()
+                await process_one(index, job)
+
+        worker_count = min(self.thread_count, len(accounts_with_cards))
+        flusher = asyncio.create_task(self._progress_flusher())
+        try:
+            results = await asyncio.gather(*[worker() for _ in range(worker_count)], return_exceptions=True)
+        finally:
+            flusher.cancel()
+            self._flush_progress()
+        for result in results:
+            if isinstance(result, Exception):
+                self._log(f"❌ 工作协程异常: {result}")
 
         self._log("✅ 所有账号处理完成")
 
@@ -173,6 +248,13 @@ class BindCardAIWorker(QThread):
 class BindCardAIDialog(QDialog):
     """绑卡订阅 AI 版主对话框"""
 
+    # 状态列配色（只创建一次，进度更新时复用）
+    _BRUSH_SUCCESS_BG = QBrush(QColor("#4CAF50"))
+    _BRUSH_FAIL_BG = QBrush(QColor("#f44336"))
+    _BRUSH_PROGRESS_BG = QBrush(QColor("#FF9800"))
+    _BRUSH_WHITE = QBrush(QColor("#ffffff"))
+    _BRUSH_GRAY = QBrush(QColor(150, 150, 150))
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("一键绑卡订阅 (AI Agent 版)")
@@ -180,12 +262,26 @@ class BindCardAIDialog(QDialog):
 
         self.worker = None
         self.db_manager = DBManager()
-        self.accounts = []
         self.cards = []
+        self._item_by_browser_id = {}  # browser_id -> 账号节点
+        self._all_child_items = []  # 所有账号节点
+        self._log_buffer = []  # 待刷新到日志框的消息
+
+        # 勾选变化和日志输出频繁时合并刷新，避免界面卡顿
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(50)
+        self._selection_timer.timeout.connect(self._update_selection_count)
+
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
 
         self._init_ui()
-        self._load_cards()
-        self._load_accounts()
+        # 窗口先显示，再加载账号；卡片只影响信息标签，放在账号之后加载
+        QTimer.singleShot(0, self._load_accounts)
+        QTimer.singleShot(0, self._load_cards)
 
     def _init_ui(self):
         layout = QVBoxLayout(self)
@@ -272,7 +368,7 @@ class BindCardAIDialog(QDialog):
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.tree.setRootIsDecorated(True)
         self.tree.setIndentation(15)
-        self.tree.itemChanged.connect(lambda: self._update_selection_count())
+        self.tree.itemChanged.connect(lambda: self._selection_timer.start())
         list_layout.addWidget(self.tree)
 
         layout.addWidget(list_group)
@@ -322,86 +418,90 @@ class BindCardAIDialog(QDialog):
 
     def _load_accounts(self):
         """从浏览器列表加载账号（按分组显示）"""
+        # 批量插入期间暂停重绘和信号
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        self.tree.setSortingEnabled(False)
         self.tree.clear()
-        self.accounts = []
+        self._item_by_browser_id = {}
+        self._all_child_items = []
 
         try:
             # 获取数据库账号（用于获取密码等信息）
             db_accounts = self.db_manager.get_all_accounts()
-            account_map = {acc['email']: acc for acc in db_accounts}
+            # 只处理 verified 状态的账号（已验证未绑卡），预先过滤以便循环中尽早跳过
+            verified_map = {acc['email']: acc for acc in db_accounts if acc.get('status') == 'verified'}
+
+            # 分组列表和浏览器列表互不依赖，并发请求
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                groups_future = executor.submit(get_group_list)
+                browsers_future = executor.submit(get_browser_list, page=1, limit=1000)
+                all_groups = groups_future.result() or []
+                browsers = browsers_future.result() or []
 
-            # 获取分组列表
-            all_groups = get_group_list() or []
             group_names = {}
             for g in all_groups:
                 gid = g.get('id')
                 title = g.get('title', '')
                 # 清理不可显示字符
-                clean_title = ''.join(c for c in str(title) if c.isprintable())
+                clean_title = _sanitize_name(str(title))
                 if not clean_title or '\ufffd' in clean_title:
                     clean_title = f"分组 {gid}"
                 group_names[gid] = clean_title
             group_names[0] = "未分组"
             group_names[1] = "默认分组"
 
-            # 获取浏览器列表
-            browsers = get_browser_list(page=1, limit=1000) or []
-
-            # 按分组组织浏览器
-            grouped = {gid: [] for gid in group_names.keys()}
+            # 收集 (分组ID, 账号数据)，稍后按分组排序后 groupby
+            account_rows = []
             for browser in browsers:
-                gid = browser.get('group_id', 0) or 0
-                if gid not in grouped:
-                    grouped[gid] = []
-                    gname = browser.get('group_name', '') or ''
-                    clean_gname = ''.join(c for c in str(gname) if c.isprintable())
-                    if not clean_gname or '\ufffd' in clean_gname:
-                        clean_gname = f"分组 {gid}"
-                    group_names[gid] = clean_gname
-
-                browser_id = browser.get('id', '') or browser.get('profile_id', '')
                 browser_name = browser.get('name', '')
 
-                # 从名称或备注中提取邮箱
-                email = browser_name
+                # 从名称或备注中提取邮箱（partition 单次扫描，不生成列表）
                 note = browser.get('note', '') or ''
-                if '----' in note:
-                    email = note.split('----')[0].strip()
-                elif '----' in browser_name:
-                    email = browser_name.split('----')[0].strip()
+                head, sep, _ = note.partition('----')
+                if sep:
+                    email = head.strip()
+                else:
+                    head, sep, _ = browser_name.partition('----')
+                    email = head.strip() if sep else browser_name
 
                 if '@' not in email:
                     continue
 
-                # 获取对应的账号信息
-                account = account_map.get(email, {})
-
-                # 只处理 verified 状态的账号（已验证未绑卡）
-                status = account.get('status', '')
-                if status != 'verified':
+                # 获取对应的账号信息（非 verified 账号直接跳过）
+                account = verified_map.get(email)
+                if account is None:
                     continue
 
+                gid = browser.get('group_id', 0) or 0
+                if gid not in group_names:
+                    gname = browser.get('group_name', '') or ''
+                    clean_gname = _sanitize_name(str(gname))
+                    if not clean_gname or '\ufffd' in clean_gname:
+                        clean_gname = f"分组 {gid}"
+                    group_names[gid] = clean_gname
+
+                browser_id = browser.get('id', '') or browser.get('profile_id', '')
+
                 account_data = {
                     'browser_id': str(browser_id),
                     'email': email,
                     'password': account.get('password', ''),
                     'secret': account.get('secret', '') or account.get('secret_key', ''),
                 }
-                grouped[gid].append(account_data)
+                account_rows.append((gid, account_data))
 
-            # 创建树形结构
+            # 创建树形结构（稳定排序，组内保持原有顺序；无账号的分组自然跳过）
             total_count = 0
+            account_rows.sort(key=itemgetter(0))
 
-            for gid in sorted(grouped.keys()):
-                account_list = grouped[gid]
-                if not account_list:
-                    continue  # 跳过空分组
+            for gid, rows in groupby(account_rows, key=itemgetter(0)):
+                account_list = [account_data for _, account_data in rows]
 
                 group_name = group_names.get(gid, f"分组 {gid}")
 
                 # 分组节点
                 group_item = QTreeWidgetItem(self.tree)
-                group_item.setText(0, "")
                 group_item.setText(1, f"📁 {group_name} ({len(account_list)})")
                 group_item.setFlags(
                     group_item.flags() |
@@ -417,12 +517,13 @@ class BindCardAIDialog(QDialog):
                 font.setBold(True)
                 group_item.setFont(1, font)
 
-                # 账号子节点
+                # 账号子节点（先离树构建，再一次性挂到分组下）
+                children = []
                 for account_data in account_list:
                     email = account_data['email']
                     browser_id = account_data['browser_id']
 
-                    child = QTreeWidgetItem(group_item)
+                    child = QTreeWidgetItem()
                     child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
                     child.setCheckState(0, Qt.CheckState.Checked)
                     child.setText(1, email)
@@ -434,37 +535,50 @@ class BindCardAIDialog(QDialog):
                         "data": account_data
                     })
 
-                    self.accounts.append(account_data)
+                    self._item_by_browser_id[browser_id] = child
+                    self._all_child_items.append(child)
+                    children.append(child)
                     total_count += 1
 
-            self._log(f"加载完成：{total_count} 个 verified 账号，{len(self.cards)} 张卡片")
-            self._update_selection_count()
+                group_item.addChildren(children)
+
+            self._log(f"加载完成：{total_count} 个 verified 账号")
 
         except Exception as e:
             self._log(f"❌ 加载账号失败: {e}")
             traceback.print_exc()
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+            self._update_selection_count()
 
     def _refresh_all(self):
         """刷新所有数据"""
-        self._load_cards()
         self._load_accounts()
+        self._load_cards()
 
     def _select_all(self):
         """全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
+        self.tree.blockSignals(True)
+        try:
+            for child in self._all_child_items:
                 child.setCheckState(0, Qt.CheckState.Checked)
+        finally:
+            self.tree.blockSignals(False)
+        self.tree.viewport().update()
         self._update_selection_count()
 
     def _deselect_all(self):
         """取消全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Unchecked)
+        self.tree.blockSignals(True)
+        try:
+            root = self.tree.invisibleRootItem()
+            for i in range(root.childCount()):
+                group_item = root.child(i)
+                group_item.setCheckState(0, Qt.CheckState.Unchecked)
+        finally:
+            self.tree.blockSignals(False)
+        self.tree.viewport().update()
         self._update_selection_count()
 
     def _update_selection_count(self):
@@ -475,20 +589,25 @@ class BindCardAIDialog(QDialog):
     def _get_selected_accounts(self) -> list[dict]:
         """获取选中的账号"""
         selected = []
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    data = child.data(0, Qt.ItemDataRole.UserRole)
-                    if data and data.get("type") == "browser":
-                        selected.append(data.get("data"))
+        for child in self._all_child_items:
+            if child.checkState(0) == Qt.CheckState.Checked:
+                data = child.data(0, Qt.ItemDataRole.UserRole)
+                if data and data.get("type") == "browser":
+                    selected.append(data.get("data"))
         return selected
 
     def _log(self, message: str):
-        """添加日志"""
-        self.log_text.append(message)
+        """添加日志（缓冲后定时批量刷新）"""
+        self._log_buffer.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """将缓冲的日志一次性写入日志框"""
+        if not self._log_buffer:
+            return
+        self.log_text.append("\n".join(self._log_buffer))
+        self._log_buffer.clear()
         self.log_text.ensureCursorVisible()
 
     def _get_ai_config(self) -> dict:
@@ -577,44 +696,41 @@ class BindCardAIDialog(QDialog):
             self._log("正在停止任务...")
             self.stop_btn.setEnabled(False)
 
-    def _on_progress(self, browser_id: str, status: str, message: str, card_number: str):
-        """进度更新"""
-        # 更新列表项状态
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.text(2) == browser_id:
-                    child.setText(3, status)
-                    # 更新卡片列显示分配的卡号
-                    if card_number:
-                        child.setText(4, card_number)
-
-                    if status == "成功":
-                        child.setBackground(3, QColor("#4CAF50"))
-                        child.setForeground(3, QColor("#ffffff"))
-                        # 更新账号状态为 subscribed
-                        email = child.text(1)
-                        DBManager.update_status(email, "subscribed", "绑卡成功")
-                        # 记录绑卡历史（供综合查询使用）
-                        if card_number:
-                            DBManager.add_bind_card_history(email, card_number[-4:] if len(card_number) >= 4 else card_number)
-                        # 设置置灰样式（跳过状态列，保留绿色背景的可读性）
-                        gray_color = QColor(150, 150, 150)
-                        gray_brush = QBrush(gray_color)
-                        for col in [0, 1, 2, 4]:  # 跳过状态列(3)
-                            child.setForeground(col, gray_brush)
-
-                    elif status == "失败" or status == "错误":
-                        child.setBackground(3, QColor("#f44336"))
-                        child.setForeground(3, QColor("#ffffff"))
-
-                    elif status == "处理中":
-                        child.setText(3, "处理中...")
-                        child.setBackground(3, QColor("#FF9800"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    return
+    def _on_progress(self, updates: dict):
+        """批量进度更新 {browser_id: (status, message, card_number)}"""
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for browser_id, (status, message, card_number) in updates.items():
+                self._apply_progress(browser_id, status, message, card_number)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def _apply_progress(self, browser_id: str, status: str, message: str, card_number: str):
+        """更新单个账号行的状态"""
+        child = self._item_by_browser_id.get(browser_id)
+        if child is None:
+            return
+
+        child.setText(3, status)
+        # 更新卡片列显示分配的卡号
+        if card_number:
+            child.setText(4, card_number)
+
+        if status == "成功":
+            child.setBackground(3, self._BRUSH_SUCCESS_BG)
+            child.setForeground(3, self._BRUSH_WHITE)
+            # 设置置灰样式（跳过状态列，保留绿色背景的可读性）
+            for col in (0, 1, 2, 4):  # 跳过状态列(3)
+                child.setForeground(col, self._BRUSH_GRAY)
+
+        elif status == "失败" or status == "错误" or status == "已取消":
+            child.setBackground(3, self._BRUSH_FAIL_BG)
+            child.setForeground(3, self._BRUSH_WHITE)
+
+        elif status == "处理中":
+            child.setText(3, "处理中...")
+            child.setBackground(3, self._BRUSH_PROGRESS_BG)
+            child.setForeground(3, self._BRUSH_WHITE)
 
     def _on_finished(self):
         """处理完成"""
@@ -4,6 +4,7 @@
 from .config_manager import ConfigManager
 from .retry_helper import RetryHelper, FailedTaskQueue, with_retry, with_retry_async
 from .data_parser import parse_account_line, build_account_line
+from .api_cache import cached_call, invalidate as invalidate_api_cache
 
 # AI Browser Agent (延迟导入，避免依赖问题)
 try:
@@ -25,6 +26,7 @@ __all__ = [
     'ConfigManager',
     'RetryHelper', 'FailedTaskQueue', 'with_retry', 'with_retry_async',
     'parse_account_line', 'build_account_line',
+    'cached_call', 'invalidate_api_cache',
     # AI Browser Agent
     'AIBrowserAgent', 'VisionAnalyzer', 'ActionExecutor',
     'ActionType', 'AgentAction', 'AgentState', 'TaskResult', 'TaskContext',
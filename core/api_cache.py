@@ -0,0 +1,55 @@
+"""
+API 结果缓存
+为 ixBrowser 列表类接口（分组列表、窗口列表）提供带过期时间的进程内缓存，
+避免对话框重复打开或切换过滤器时反复发起相同的 HTTP 请求
+"""
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+# key -> (过期时间戳, 结果)
+_cache: dict = {}
+_lock = threading.Lock()
+
+
+def cached_call(key: Hashable, ttl: float, fn: Callable, *args, force: bool = False, **kwargs) -> Any:
+    """
+    带 TTL 的缓存调用
+
+    Args:
+        key: 缓存键，通常为 (接口名, 参数...) 元组
+        ttl: 有效期（秒）
+        fn: 实际调用的函数
+        *args, **kwargs: 传给 fn 的参数
+        force: 为 True 时忽略缓存，强制重新调用并刷新缓存
+
+    Returns:
+        fn 的返回值（None 或空结果不缓存，以便下次重试）
+    """
+    now = time.monotonic()
+    if not force:
+        with _lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+    value = fn(*args, **kwargs)
+
+    if value:
+        with _lock:
+            _cache[key] = (time.monotonic() + ttl, value)
+    return value
+
+
+def invalidate(key: Optional[Hashable] = None):
+    """
+    使缓存失效
+
+    Args:
+        key: 指定缓存键；为 None 时清空全部缓存
+    """
+    with _lock:
+        if key is None:
+            _cache.clear()
+        else:
+            _cache.pop(key, None)
@@ -5,6 +5,29 @@
 import re
 from typing import Tuple, Optional
 
+# 逐行解析时复用的预编译正则
+# 匹配 URL，但不匹配分隔符后面的内容（非贪婪）
+_URL_RE = re.compile(r'(https?://[^\s\-\|,;]+?)(?=\s*[-]{2,}|\s*\||\s*,|\s*;|\s*$)')
+# 移除链接后开头残留的分隔符
+_LEADING_DASHES_RE = re.compile(r'^[-]{2,}')
+
+
+def _split_four_fields(line: str, separator: str) -> Optional[Tuple[str, str, str, str]]:
+    """
+    用 partition 链切出前 4 个字段，不为整行构建 split 列表
+
+    仅当 4 个字段都非空时返回（最常见的完整格式）；否则返回 None，
+    由调用方走通用路径（通用路径会跳过空段，字段位置可能前移）
+    """
+    email, _, rest = line.partition(separator)
+    password, _, rest = rest.partition(separator)
+    recovery, _, rest = rest.partition(separator)
+    secret = rest.partition(separator)[0].strip()
+    email, password, recovery = email.strip(), password.strip(), recovery.strip()
+    if email and password and recovery and secret:
+        return email, password, recovery, secret
+    return None
+
 
 def parse_account_line(line: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]:
     """
@@ -39,15 +62,13 @@ def parse_account_line(line: str) -> Tuple[Optional[str], Optional[str], Optiona
 
     # Step 1: 提取 HTTP/HTTPS 链接（使用非贪婪匹配）
     link = None
-    # 匹配 URL，但不匹配分隔符后面的内容
-    url_pattern = r'(https?://[^\s\-\|,;]+?)(?=\s*[-]{2,}|\s*\||\s*,|\s*;|\s*$)'
-    url_match = re.search(url_pattern, line)
+    url_match = _URL_RE.search(line)
     if url_match:
         link = url_match.group(1).strip()
         # 从原始行中移除链接
         line = line.replace(url_match.group(0), '', 1).strip()
         # 移除开头可能残留的分隔符
-        line = re.sub(r'^[-]{2,}', '', line).strip()
+        line = _LEADING_DASHES_RE.sub('', line).strip()
 
     # Step 2: 检测并使用分隔符
     separator = '----'  # 默认分隔符
@@ -58,6 +79,11 @@ def parse_account_line(line: str) -> Tuple[Optional[str], Optional[str], Optiona
             separator = sep
             break
 
+    # 快速路径：邮箱----密码----辅助邮箱----密钥 完整格式，无需切分整行
+    fields = _split_four_fields(line, separator)
+    if fields is not None and '@' in fields[0] and '.' in fields[0].rpartition('@')[2]:
+        return fields[0], fields[1], fields[2], fields[3], link
+
     # Step 3: 分割并清理
     parts = line.split(separator)
     parts = [p.strip() for p in parts if p.strip()]
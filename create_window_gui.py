@@ -20,7 +20,8 @@ from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QColor, QIcon
 from ix_window import (
     get_browser_list, get_browser_info,
-    delete_browsers_by_name, delete_browser_by_id, open_browser_by_id, create_browser_window, get_next_window_name
+    delete_browsers_by_name, delete_browser_by_id, open_browser_by_id, create_browser_window, get_next_window_name,
+    build_browser_name_index
 )
 from ix_api import get_group_list
 from database import DBManager
@@ -367,7 +368,8 @@ class WorkerThread(QThread):
                 except:
                     pass
             
-            # 为每个账户创建窗口
+            # 为每个账户创建窗口（本批次共用一份名称索引，查重只拉取一次窗口列表）
+            name_index = build_browser_name_index()
             success_count = 0
             for i, account in enumerate(accounts, 1):
                 if not self.is_running:
@@ -386,7 +388,8 @@ class WorkerThread(QThread):
                     proxy,
                     template_config=template_config,
                     name_prefix=name_prefix,
-                    group_id=group_id
+                    group_id=group_id,
+                    name_index=name_index
                 )
                 
                 if browser_id:
@@ -124,14 +124,16 @@ class DBManager:
                 continue
             
             try:
+                # 单次遍历文件句柄：逐行过滤并解析，不先读入全部行
                 with open(path, 'r', encoding='utf-8') as f:
-                    lines = [l.strip() for l in f.readlines() if l.strip() and not l.startswith('#')]
-                
-                for line in lines:
-                    email, pwd, rec, sec, link = DBManager._simple_parse(line)
-                    if email:
-                        DBManager.upsert_account(email, pwd, rec, sec, link, status=status)
-                        count_status += 1
+                    for raw in f:
+                        line = raw.strip()
+                        if not line or raw.startswith('#'):
+                            continue
+                        email, pwd, rec, sec, link = DBManager._simple_parse(line)
+                        if email:
+                            DBManager.upsert_account(email, pwd, rec, sec, link, status=status)
+                            count_status += 1
             except Exception as e:
                 print(f"从 {filename} 导入时出错: {e}")
         
@@ -541,6 +543,31 @@ class DBManager:
         except Exception as e:
             print(f"[DB ERROR] add_phone_modification 失败: {e}")
 
+    @staticmethod
+    def add_phone_modifications_batch(records: list):
+        """批量添加或更新手机号修改记录（一个事务），records 为 [(email, new_phone), ...]"""
+        if not records:
+            return
+        try:
+            # 确保表存在
+            DBManager.init_phone_modification_table()
+
+            with lock:
+                conn = DBManager.get_connection()
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT INTO phone_modification_history (email, new_phone, modified_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(email) DO UPDATE SET
+                        new_phone = excluded.new_phone,
+                        modified_at = CURRENT_TIMESTAMP
+                ''', records)
+                conn.commit()
+                conn.close()
+                print(f"[DB] 批量记录手机号修改: {len(records)} 条")
+        except Exception as e:
+            print(f"[DB ERROR] add_phone_modifications_batch 失败: {e}")
+
     @staticmethod
     def clear_phone_modification_history():
         """清除所有手机号修改历史记录"""
@@ -1058,6 +1085,47 @@ class DBManager:
         except Exception as e:
             print(f"[DB ERROR] add_bind_card_history 失败: {e}")
 
+    @staticmethod
+    def mark_bind_card_success(email: str, card_number: str = None, message: str = "绑卡成功"):
+        """绑卡成功：更新账号状态为 subscribed 并记录绑卡历史（单连接单事务）"""
+        if not email:
+            return
+        try:
+            with lock:
+                conn = DBManager.get_connection()
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE accounts SET status = ?, message = ?, updated_at = CURRENT_TIMESTAMP WHERE email = ?",
+                    ("subscribed", message, email)
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute(
+                        "INSERT INTO accounts (email, status, message) VALUES (?, ?, ?)",
+                        (email, "subscribed", message)
+                    )
+                if card_number:
+                    cursor.execute('''
+                        CREATE TABLE IF NOT EXISTS bind_card_history (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            email TEXT NOT NULL,
+                            card_number TEXT NOT NULL,
+                            bound_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            UNIQUE(email)
+                        )
+                    ''')
+                    cursor.execute('''
+                        INSERT INTO bind_card_history (email, card_number, bound_at)
+                        VALUES (?, ?, CURRENT_TIMESTAMP)
+                        ON CONFLICT(email) DO UPDATE SET
+                            card_number = excluded.card_number,
+                            bound_at = CURRENT_TIMESTAMP
+                    ''', (email, card_number))
+                conn.commit()
+                conn.close()
+                print(f"[DB] 绑卡成功: {email} -> {card_number}")
+        except Exception as e:
+            print(f"[DB ERROR] mark_bind_card_success 失败，email: {email}, 错误: {e}")
+
     @staticmethod
     def clear_bind_card_history() -> int:
         """清除所有绑卡历史记录"""
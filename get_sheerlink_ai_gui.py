@@ -5,9 +5,17 @@
 使用 AI Agent 模式（Gemini Vision）
 AI 配置请在「配置管理 → 全局设置」中设置
 """
+import re
 import sys
 import asyncio
+import threading
+import time
 import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
 
 from PyQt6.QtWidgets import (
     QDialog,
@@ -25,26 +33,157 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QAbstractItemView,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QColor, QBrush
 
 from ix_api import get_group_list
-from ix_window import get_browser_list
+from ix_window import get_browser_list_parallel
 from database import DBManager
 from core.config_manager import ConfigManager
+from core.api_cache import cached_call
 from auto_get_sheerlink_ai import auto_get_sheerlink_ai
 
+# 分组/窗口列表缓存有效期（秒），切换过滤器时复用，点击「刷新列表」强制重新获取
+API_CACHE_TTL = 60
+
+# 不可显示字符（控制字符、格式字符、非空格分隔符），用于清理分组名称
+_NON_PRINTABLE_RE = re.compile(r'[\x00-\x1f\x7f-\xa0\xad\u2000-\u200f\u2028-\u202f\u205f-\u2064\u3000\ufeff]+')
+
+# 名称/备注中 "邮箱----..." 格式的邮箱部分（取第一个分隔符之前的内容）
+_EMAIL_SPLIT_RE = re.compile(r'(.*?)----', re.DOTALL)
+
+# 状态显示文本
+_STATUS_DISPLAY = {
+    'pending': '待处理',
+    'subscribed': '已绑卡',
+    'verified': '已验证',
+    'link_ready': '待验证',
+    'ineligible': '无资格',
+    'error': '错误',
+}
+
+# 执行进度中的状态显示文本（失败显示为"失败"，并包含"处理中"）
+_PROGRESS_STATUS_DISPLAY = {
+    **_STATUS_DISPLAY,
+    'error': '失败',
+    sys.intern('处理中'): '处理中...',
+}
+
+# 统计标签模板
+_STATS_TMPL = (
+    "📊 总计: {s.total} | 💳 已绑卡: {s.subscribed} | ✅ 已验证: {s.verified} | "
+    "🔗 待验证: {s.link_ready} | ❌ 无资格: {s.ineligible} | ⚠️ 错误: {s.error}"
+)
+
+# 任务完成提示模板
+_DONE_TMPL = "AI SheerLink 检测任务已完成\n\n成功: {s} 个\n失败: {f} 个"
+
+# 检测结果状态 -> 完成统计分类
+_STATUS_BUCKET = {
+    'subscribed': 'success',
+    'verified': 'success',
+    'link_ready': 'success',
+    'ineligible': 'fail',
+    'error': 'fail',
+}
+
+# 检测结果状态集合（不含 "处理中" 等中间状态及统计字段 total）
+_RESULT_STATUSES = frozenset(_STATUS_BUCKET)
+
+# 状态列配色 (背景, 前景)，只创建一次
+_WHITE_BRUSH = QBrush(QColor("#ffffff"))
+_ORANGE_BRUSH = QBrush(QColor("#FF9800"))
+# 只读视图：画刷为全部对话框实例共享，防止被意外修改
+_STATUS_BRUSHES = MappingProxyType({
+    'subscribed': (QBrush(QColor("#2196F3")), _WHITE_BRUSH),
+    'verified': (QBrush(QColor("#4CAF50")), _WHITE_BRUSH),
+    'link_ready': (_ORANGE_BRUSH, _WHITE_BRUSH),
+    'ineligible': (QBrush(QColor("#9E9E9E")), _WHITE_BRUSH),
+    'error': (QBrush(QColor("#f44336")), _WHITE_BRUSH),
+    'pending': (QBrush(QColor("#607D8B")), _WHITE_BRUSH),
+    sys.intern('处理中'): (None, _ORANGE_BRUSH),
+})
+
+
+@dataclass(slots=True)
+class AccountRow:
+    """账号列表中的一行（浏览器窗口 + 数据库账号信息）"""
+    browser_id: str
+    email: str
+    password: str
+    secret: str
+    status: str
+    group_id: int
+
+
+@dataclass(slots=True, frozen=True)
+class Stats:
+    """检测统计快照（工作线程发往界面，不可变）"""
+    total: int = 0
+    subscribed: int = 0
+    verified: int = 0
+    link_ready: int = 0
+    ineligible: int = 0
+    error: int = 0
+
+
+def _set_status_style(item: QTreeWidgetItem, status: str):
+    """按状态设置状态列配色（一次字典查找，未知状态保持原样）"""
+    style = _STATUS_BRUSHES.get(status)
+    if style is None:
+        return
+    bg, fg = style
+    if bg is not None:
+        item.setBackground(3, bg)
+    if fg is not None:
+        item.setForeground(3, fg)
+
+
+def _clean_group_name(name, gid) -> str:
+    """清理分组名称中的不可显示字符，清理后为空或含乱码时使用默认名称"""
+    clean_name = _NON_PRINTABLE_RE.sub('', str(name))
+    if not clean_name or '\ufffd' in clean_name:
+        clean_name = f"分组 {gid}"
+    return clean_name
+
+
+def _build_account_data(browser: dict, account_map: dict, gid: int):
+    """从浏览器信息提取邮箱并关联数据库账号，无法提取邮箱时返回 None"""
+    browser_name = browser.get('name', '')
+
+    # 从名称或备注中提取邮箱
+    note = browser.get('note', '') or ''
+    m = _EMAIL_SPLIT_RE.match(note) or _EMAIL_SPLIT_RE.match(browser_name)
+    email = m.group(1).strip() if m else browser_name
+
+    if '@' not in email:
+        return None
+
+    # 获取对应的账号信息
+    account = account_map.get(email, {})
+    # 驻留数据库读出的状态，过滤/显示/配色时与字典键按身份比较
+    status = sys.intern(account.get('status') or 'pending')
+
+    browser_id = browser.get('id', '') or browser.get('profile_id', '')
+    return AccountRow(
+        browser_id=str(browser_id),
+        email=email,
+        password=account.get('password', ''),
+        secret=account.get('secret', '') or account.get('secret_key', ''),
+        status=status,  # 保存状态用于显示
+        group_id=gid,
+    )
+
 
 class GetSheerlinkAIWorker(QThread):
     """后台工作线程"""
-    progress_signal = pyqtSignal(str, str, str, str)  # browser_id, status, message, link
     finished_signal = pyqtSignal()
     log_signal = pyqtSignal(str)
-    stats_signal = pyqtSignal(dict)  # 统计信息
+    stats_signal = pyqtSignal(object)  # 统计信息 (Stats)
 
     def __init__(
         self,
-        accounts: list[dict],
+        accounts: list[AccountRow],
         thread_count: int,
         close_after: bool,
         ai_config: dict = None,
@@ -54,7 +193,12 @@ class GetSheerlinkAIWorker(QThread):
         self.thread_count = max(1, thread_count)
         self.close_after = close_after
         self.ai_config = ai_config or {}
-        self.is_running = True
+        # 统计发送节流：最多每 0.25 秒发送一次，且仅在数值变化时发送
+        self._last_emitted = None
+        self._last_emit_t = 0.0
+        # 进度更新发件箱：工作线程追加，界面定时器整批取走，避免每条更新一个跨线程信号
+        self._outbox = []
+        self._outbox_lock = threading.Lock()
         # 统计
         self.stats = {
             'subscribed': 0,
@@ -66,11 +210,39 @@ class GetSheerlinkAIWorker(QThread):
         }
 
     def stop(self):
-        self.is_running = False
+        """请求停止：不再启动新账号，进行中的账号处理完后退出"""
+        self.requestInterruption()
 
     def _log(self, message: str):
         self.log_signal.emit(message)
 
+    def _push_progress(self, browser_id: str, status: str, message: str, link: str):
+        """记录一条进度更新（驻留状态字符串，界面侧按身份比较字典键）"""
+        with self._outbox_lock:
+            self._outbox.append((browser_id, sys.intern(status), message, link))
+
+    def drain_progress(self) -> list:
+        """取走全部待处理的进度更新（界面线程调用）"""
+        with self._outbox_lock:
+            pending, self._outbox = self._outbox, []
+        return pending
+
+    def _snapshot(self) -> Stats:
+        """统计信息快照（跨线程发送不可变副本，避免 GUI 读取时被并发修改）"""
+        return Stats(**self.stats)
+
+    def _emit_stats(self, force: bool = False):
+        """发送统计快照（节流且去重；force=True 时忽略节流，用于最终统计）"""
+        now = time.monotonic()
+        if not force and now - self._last_emit_t < 0.25:
+            return
+        snapshot = self._snapshot()
+        if snapshot == self._last_emitted:
+            return
+        self._last_emitted = snapshot
+        self._last_emit_t = now
+        self.stats_signal.emit(snapshot)
+
     def run(self):
         try:
             asyncio.run(self._process_all())
@@ -78,7 +250,7 @@ class GetSheerlinkAIWorker(QThread):
             self._log(f"❌ 工作线程异常: {e}")
             traceback.print_exc()
         finally:
-            self.stats_signal.emit(self.stats)
+            self._emit_stats(force=True)
             self.finished_signal.emit()
 
     async def _process_all(self):
@@ -88,58 +260,79 @@ class GetSheerlinkAIWorker(QThread):
 
         self._log(f"开始处理 {len(self.accounts)} 个账号，并发数: {self.thread_count}")
 
-        # 使用信号量控制并发
+        # 先获取信号量再创建任务，同一时刻最多只存在 thread_count 个任务
         semaphore = asyncio.Semaphore(self.thread_count)
 
-        async def process_one(index: int, account: dict):
-            async with semaphore:
-                if not self.is_running:
-                    return
-
-                browser_id = account.get('browser_id', '')
-                email = account.get('email', 'Unknown')
-
-                self._log(f"[{index + 1}] 开始检测: {email} ({browser_id})")
-                self.progress_signal.emit(browser_id, "处理中", "正在检测...", "")
-
-                try:
-                    account_info = {
-                        'email': account.get('email', ''),
-                        'password': account.get('password', ''),
-                        'secret': account.get('secret', ''),
-                    }
-
-                    success, msg, status, link = await auto_get_sheerlink_ai(
-                        browser_id,
-                        account_info,
-                        self.close_after,
-                        api_key=self.ai_config.get('api_key'),
-                        base_url=self.ai_config.get('base_url'),
-                        model=self.ai_config.get('model', 'gemini-2.5-flash'),
-                        max_steps=self.ai_config.get('max_steps', 20),
-                    )
+        async def process_one(index: int, account: AccountRow):
+            if self.isInterruptionRequested():
+                return
 
-                    # 更新统计
-                    self.stats['total'] += 1
-                    if status in self.stats:
-                        self.stats[status] += 1
+            browser_id = account.browser_id
+            email = account.email or 'Unknown'
 
-                    if success:
-                        self._log(f"[{index + 1}] ✅ {email}: {status} - {msg}")
-                        self.progress_signal.emit(browser_id, status, msg, link or "")
-                    else:
-                        self._log(f"[{index + 1}] ❌ {email}: {msg}")
-                        self.progress_signal.emit(browser_id, "error", msg, "")
+            self._log(f"[{index + 1}] 开始检测: {email} ({browser_id})")
+            self._push_progress(browser_id, "处理中", "正在检测...", "")
+
+            try:
+                account_info = {
+                    'email': account.email,
+                    'password': account.password,
+                    'secret': account.secret,
+                }
 
-                except Exception as e:
-                    self._log(f"[{index + 1}] ❌ {email}: {e}")
-                    self.progress_signal.emit(browser_id, "error", str(e), "")
-                    self.stats['error'] += 1
-                    self.stats['total'] += 1
+                success, msg, status, link = await auto_get_sheerlink_ai(
+                    browser_id,
+                    account_info,
+                    self.close_after,
+                    api_key=self.ai_config.get('api_key'),
+                    base_url=self.ai_config.get('base_url'),
+                    model=self.ai_config.get('model', 'gemini-2.5-flash'),
+                    max_steps=self.ai_config.get('max_steps', 20),
+                )
 
-        # 并发执行
-        tasks = [process_one(i, acc) for i, acc in enumerate(self.accounts)]
-        await asyncio.gather(*tasks)
+                # 更新统计
+                self.stats['total'] += 1
+                if status in _RESULT_STATUSES:
+                    self.stats[status] += 1
+
+                if success:
+                    self._log(f"[{index + 1}] ✅ {email}: {status} - {msg}")
+                    self._push_progress(browser_id, status, msg, link or "")
+                else:
+                    self._log(f"[{index + 1}] ❌ {email}: {msg}")
+                    self._push_progress(browser_id, "error", msg, "")
+
+            except Exception as e:
+                self._log(f"[{index + 1}] ❌ {email}: {e}")
+                self._push_progress(browser_id, "error", str(e), "")
+                self.stats['error'] += 1
+                self.stats['total'] += 1
+
+            self._emit_stats()
+
+        pending = set()
+
+        def on_done(task: asyncio.Task):
+            pending.discard(task)
+            semaphore.release()
+            # process_one 自身已捕获业务异常，这里兜底记录意外崩溃，避免静默丢失
+            if not task.cancelled() and task.exception() is not None:
+                self.stats['error'] += 1
+                self.stats['total'] += 1
+                self._log(f"❌ 任务异常: {task.exception()!r}")
+                self._emit_stats()
+
+        for i, acc in enumerate(self.accounts):
+            await semaphore.acquire()
+            if self.isInterruptionRequested():
+                semaphore.release()
+                break
+            task = asyncio.create_task(process_one(i, acc))
+            pending.add(task)
+            task.add_done_callback(on_done)
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
         self._log("✅ 所有账号处理完成")
 
@@ -154,10 +347,36 @@ class GetSheerlinkAIDialog(QDialog):
 
         self.worker = None
         self.db_manager = DBManager()
-        self.accounts = []
+        self._total_items = 0  # 树中账号节点总数（建树时累加）
+        self._id_to_account = {}  # browser_id -> 账号数据（按树中顺序）
+        self._selected_ids = set()  # 已勾选账号的 browser_id
+        self._item_by_browser_id = {}  # browser_id -> 账号节点
+        self._counts = {}  # 本次任务的完成统计，随进度更新增量维护
+        self._update_depth = 0  # _batch_tree_updates 嵌套深度
+        self._group_names = {}  # 分组ID -> 分组名称
+        self._grouped_by_gid = {}  # 分组ID -> 全部账号数据（未过滤）
+        self._sorted_gids = []
+        self._last_filter_set = None  # 上次应用的过滤器，未变化时跳过
+        self._group_items = []  # [(分组节点, 分组名称, [(账号节点, 账号数据)])]
+        self._ai_config_cache = None  # AI 配置缓存，窗口每次显示时失效
+        self._close_pending = False  # 关闭时工作线程未及时退出，待其结束后再关闭
+
+        # 定时批量应用进度更新，重绘频率与工作线程吞吐量解耦
+        self._update_timer = QTimer(self)
+        self._update_timer.setInterval(100)
+        self._update_timer.timeout.connect(self._flush_updates)
+
+        # 统计标签合并刷新：只保留最新统计，单次定时器触发时再渲染
+        self._pending_stats = None
+        self._last_stats = None  # 上次渲染的统计值，未变化时跳过 setText
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setSingleShot(True)
+        self._stats_timer.setInterval(150)
+        self._stats_timer.timeout.connect(self._flush_stats)
 
         self._init_ui()
-        self._load_accounts()
+        # 窗口先显示，再在下一轮事件循环加载账号
+        QTimer.singleShot(0, self._load_accounts)
 
     def _init_ui(self):
         layout = QVBoxLayout(self)
@@ -203,34 +422,44 @@ class GetSheerlinkAIDialog(QDialog):
 
         self.filter_pending = QCheckBox("pending (待处理)")
         self.filter_pending.setChecked(True)  # 默认选中
-        self.filter_pending.stateChanged.connect(self._load_accounts)
+        self.filter_pending.stateChanged.connect(self._apply_filter)
         filter_layout.addWidget(self.filter_pending)
 
         self.filter_error = QCheckBox("error (错误)")
         self.filter_error.setChecked(True)  # 默认选中
-        self.filter_error.stateChanged.connect(self._load_accounts)
+        self.filter_error.stateChanged.connect(self._apply_filter)
         filter_layout.addWidget(self.filter_error)
 
         self.filter_link_ready = QCheckBox("link_ready (待验证)")
         self.filter_link_ready.setChecked(False)
-        self.filter_link_ready.stateChanged.connect(self._load_accounts)
+        self.filter_link_ready.stateChanged.connect(self._apply_filter)
         filter_layout.addWidget(self.filter_link_ready)
 
         self.filter_verified = QCheckBox("verified (已验证)")
         self.filter_verified.setChecked(False)
-        self.filter_verified.stateChanged.connect(self._load_accounts)
+        self.filter_verified.stateChanged.connect(self._apply_filter)
         filter_layout.addWidget(self.filter_verified)
 
         self.filter_subscribed = QCheckBox("subscribed (已绑卡)")
         self.filter_subscribed.setChecked(False)
-        self.filter_subscribed.stateChanged.connect(self._load_accounts)
+        self.filter_subscribed.stateChanged.connect(self._apply_filter)
         filter_layout.addWidget(self.filter_subscribed)
 
         self.filter_ineligible = QCheckBox("ineligible (无资格)")
         self.filter_ineligible.setChecked(False)
-        self.filter_ineligible.stateChanged.connect(self._load_accounts)
+        self.filter_ineligible.stateChanged.connect(self._apply_filter)
         filter_layout.addWidget(self.filter_ineligible)
 
+        # 过滤复选框与对应状态，读取过滤器时直接遍历
+        self._status_filter_checks = (
+            (self.filter_pending, 'pending'),
+            (self.filter_error, 'error'),
+            (self.filter_link_ready, 'link_ready'),
+            (self.filter_verified, 'verified'),
+            (self.filter_subscribed, 'subscribed'),
+            (self.filter_ineligible, 'ineligible'),
+        )
+
         filter_layout.addStretch()
 
         layout.addWidget(filter_group)
@@ -251,7 +480,7 @@ class GetSheerlinkAIDialog(QDialog):
         toolbar.addWidget(self.deselect_all_btn)
 
         self.refresh_btn = QPushButton("刷新列表")
-        self.refresh_btn.clicked.connect(self._load_accounts)
+        self.refresh_btn.clicked.connect(self._refresh_accounts)
         toolbar.addWidget(self.refresh_btn)
 
         toolbar.addStretch()
@@ -272,7 +501,7 @@ class GetSheerlinkAIDialog(QDialog):
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.tree.setRootIsDecorated(True)
         self.tree.setIndentation(15)
-        self.tree.itemChanged.connect(lambda: self._update_selection_count())
+        self.tree.itemChanged.connect(self._on_item_changed)
         list_layout.addWidget(self.tree)
 
         layout.addWidget(list_group)
@@ -317,219 +546,238 @@ class GetSheerlinkAIDialog(QDialog):
 
     def _get_selected_status_filters(self) -> set:
         """获取选中的状态过滤器"""
-        filters = set()
-        if hasattr(self, 'filter_pending') and self.filter_pending.isChecked():
-            filters.add('pending')
-        if hasattr(self, 'filter_error') and self.filter_error.isChecked():
-            filters.add('error')
-        if hasattr(self, 'filter_link_ready') and self.filter_link_ready.isChecked():
-            filters.add('link_ready')
-        if hasattr(self, 'filter_verified') and self.filter_verified.isChecked():
-            filters.add('verified')
-        if hasattr(self, 'filter_subscribed') and self.filter_subscribed.isChecked():
-            filters.add('subscribed')
-        if hasattr(self, 'filter_ineligible') and self.filter_ineligible.isChecked():
-            filters.add('ineligible')
+        filters = {status for check, status in self._status_filter_checks if check.isChecked()}
         # 如果没有选中任何过滤器，默认显示 pending
         if not filters:
             filters.add('pending')
         return filters
 
-    def _load_accounts(self):
-        """从浏览器列表加载账号（按分组显示，根据状态过滤器过滤）"""
-        self.tree.clear()
-        self.accounts = []
+    def _refresh_accounts(self):
+        """强制刷新（忽略分组/窗口列表缓存）"""
+        self._load_accounts(force=True)
 
-        # 获取选中的状态过滤器
-        status_filters = self._get_selected_status_filters()
+    def _load_accounts(self, force: bool = False):
+        """从浏览器列表加载账号并按分组归类（过滤和建树由 _apply_filter 完成）"""
+        group_names = {}
+        grouped_by_gid = defaultdict(list)
 
         try:
-            # 获取数据库账号（用于获取密码等信息）
-            db_accounts = self.db_manager.get_all_accounts()
+            # 数据库账号（用于获取密码等信息）、分组列表、浏览器列表互不依赖，并发获取
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                accounts_future = executor.submit(self.db_manager.get_all_accounts)
+                groups_future = executor.submit(
+                    cached_call, ("groups",), API_CACHE_TTL, get_group_list, force=force
+                )
+                browsers_future = executor.submit(
+                    cached_call, ("browsers", 200), API_CACHE_TTL, get_browser_list_parallel,
+                    limit=200, force=force
+                )
+                db_accounts = accounts_future.result()
+                all_groups = groups_future.result() or []
+                browsers = browsers_future.result() or []
+
             account_map = {acc['email']: acc for acc in db_accounts}
 
-            # 获取分组列表
-            all_groups = get_group_list() or []
-            group_names = {}
             for g in all_groups:
                 gid = g.get('id')
-                title = g.get('title', '')
-                # 清理不可显示字符
-                clean_title = ''.join(c for c in str(title) if c.isprintable())
-                if not clean_title or '\ufffd' in clean_title:
-                    clean_title = f"分组 {gid}"
-                group_names[gid] = clean_title
+                group_names[gid] = _clean_group_name(g.get('title', ''), gid)
             group_names[0] = "未分组"
             group_names[1] = "默认分组"
 
-            # 获取浏览器列表
-            browsers = get_browser_list(page=1, limit=1000) or []
-
-            # 按分组组织浏览器
-            grouped = {gid: [] for gid in group_names.keys()}
+            # 按分组组织浏览器（循环内用到的名称先绑定为局部变量）
+            build_account_data = _build_account_data
+            clean_group_name = _clean_group_name
             for browser in browsers:
                 gid = browser.get('group_id', 0) or 0
-                if gid not in grouped:
-                    grouped[gid] = []
-                    gname = browser.get('group_name', '') or ''
-                    clean_gname = ''.join(c for c in str(gname) if c.isprintable())
-                    if not clean_gname or '\ufffd' in clean_gname:
-                        clean_gname = f"分组 {gid}"
-                    group_names[gid] = clean_gname
-
-                browser_id = browser.get('id', '') or browser.get('profile_id', '')
-                browser_name = browser.get('name', '')
-
-                # 从名称或备注中提取邮箱
-                email = browser_name
-                note = browser.get('note', '') or ''
-                if '----' in note:
-                    email = note.split('----')[0].strip()
-                elif '----' in browser_name:
-                    email = browser_name.split('----')[0].strip()
-
-                if '@' not in email:
-                    continue
-
-                # 获取对应的账号信息
-                account = account_map.get(email, {})
-
-                # 根据状态过滤器过滤
-                status = account.get('status', 'pending')
-                if status not in status_filters:
-                    continue
-
-                account_data = {
-                    'browser_id': str(browser_id),
-                    'email': email,
-                    'password': account.get('password', ''),
-                    'secret': account.get('secret', '') or account.get('secret_key', ''),
-                    'status': status,  # 保存状态用于显示
-                }
-                grouped[gid].append(account_data)
-
-            # 创建树形结构
-            total_count = 0
-
-            for gid in sorted(grouped.keys()):
-                account_list = grouped[gid]
-                if not account_list:
-                    continue  # 跳过空分组
-
-                group_name = group_names.get(gid, f"分组 {gid}")
-
-                # 分组节点
-                group_item = QTreeWidgetItem(self.tree)
-                group_item.setText(0, "")
-                group_item.setText(1, f"📁 {group_name} ({len(account_list)})")
-                group_item.setFlags(
-                    group_item.flags() |
-                    Qt.ItemFlag.ItemIsAutoTristate |
-                    Qt.ItemFlag.ItemIsUserCheckable
-                )
-                group_item.setCheckState(0, Qt.CheckState.Unchecked)
-                group_item.setExpanded(True)
-                group_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "group", "id": gid})
-
-                # 设置分组行样式
-                font = group_item.font(1)
-                font.setBold(True)
-                group_item.setFont(1, font)
-
-                # 账号子节点
-                for account_data in account_list:
-                    email = account_data['email']
-                    browser_id = account_data['browser_id']
-                    status = account_data.get('status', 'pending')
-
-                    child = QTreeWidgetItem(group_item)
-                    child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                    child.setCheckState(0, Qt.CheckState.Checked)  # 默认选中
-                    child.setText(1, email)
-                    child.setText(2, browser_id)
-
-                    # 显示当前状态
-                    status_display = {
-                        'pending': '待处理',
-                        'subscribed': '已绑卡',
-                        'verified': '已验证',
-                        'link_ready': '待验证',
-                        'ineligible': '无资格',
-                        'error': '错误',
-                    }.get(status, status)
-                    child.setText(3, status_display)
-
-                    # 状态颜色
-                    if status == "subscribed":
-                        child.setBackground(3, QColor("#2196F3"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "verified":
-                        child.setBackground(3, QColor("#4CAF50"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "link_ready":
-                        child.setBackground(3, QColor("#FF9800"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "ineligible":
-                        child.setBackground(3, QColor("#9E9E9E"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "error":
-                        child.setBackground(3, QColor("#f44336"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "pending":
-                        child.setBackground(3, QColor("#607D8B"))
-                        child.setForeground(3, QColor("#ffffff"))
-
-                    child.setText(4, "")
-                    child.setData(0, Qt.ItemDataRole.UserRole, {
-                        "type": "browser",
-                        "data": account_data
-                    })
-
-                    self.accounts.append(account_data)
-                    total_count += 1
-
-            filter_str = ", ".join(status_filters) if status_filters else "pending"
-            self._log(f"加载完成：{total_count} 个账号 (过滤器: {filter_str})")
-            self._update_selection_count()
+                if gid not in group_names:
+                    group_names[gid] = clean_group_name(browser.get('group_name', '') or '', gid)
+
+                account_data = build_account_data(browser, account_map, gid)
+                if account_data is not None:
+                    grouped_by_gid[gid].append(account_data)
 
         except Exception as e:
             self._log(f"❌ 加载账号失败: {e}")
             traceback.print_exc()
 
+        self._group_names = group_names
+        self._grouped_by_gid = grouped_by_gid
+        self._sorted_gids = sorted(grouped_by_gid)
+        self._rebuild_tree()
+
+    @contextmanager
+    def _batch_tree_updates(self):
+        """批量修改树期间暂停重绘和信号，退出最外层时合并为一次重绘（可嵌套）"""
+        if self._update_depth == 0:
+            self.tree.setUpdatesEnabled(False)
+            self.tree.viewport().setUpdatesEnabled(False)
+            self.tree.blockSignals(True)
+        self._update_depth += 1
+        try:
+            yield
+        finally:
+            self._update_depth -= 1
+            if self._update_depth == 0:
+                self.tree.blockSignals(False)
+                self.tree.viewport().setUpdatesEnabled(True)
+                self.tree.setUpdatesEnabled(True)
+                self.tree.viewport().update()
+
+    def _rebuild_tree(self):
+        """用全部账号重建树形结构（按分组显示），过滤由 _apply_filter 隐藏/显示节点完成"""
+        self._total_items = 0
+        self._id_to_account = {}
+        self._selected_ids = set()
+        self._item_by_browser_id = {}
+        self._group_items = []  # [(分组节点, 分组名称, [(账号节点, 账号数据)])]
+
+        # 批量重建期间暂停重绘和信号
+        # 插入期间关闭排序，避免每插入一项重新排序一次，结束后恢复原设置
+        sorting_enabled = self.tree.isSortingEnabled()
+        with self._batch_tree_updates():
+            self.tree.setSortingEnabled(False)
+            self.tree.clear()
+
+            # 循环内反复使用的方法、枚举先绑定为局部变量
+            display_get = _STATUS_DISPLAY.get
+            set_status_style = _set_status_style
+            id_to_account = self._id_to_account
+            item_by_browser_id = self._item_by_browser_id
+            checkable = Qt.ItemFlag.ItemIsUserCheckable
+            checked = Qt.CheckState.Checked
+            user_role = Qt.ItemDataRole.UserRole
+            try:
+                for gid in self._sorted_gids:
+                    account_list = self._grouped_by_gid[gid]
+                    if not account_list:
+                        continue  # 跳过空分组
+
+                    group_name = self._group_names.get(gid, f"分组 {gid}")
+
+                    # 分组节点
+                    group_item = QTreeWidgetItem(self.tree)
+                    group_item.setFlags(
+                        group_item.flags() |
+                        Qt.ItemFlag.ItemIsAutoTristate |
+                        Qt.ItemFlag.ItemIsUserCheckable
+                    )
+                    group_item.setCheckState(0, Qt.CheckState.Unchecked)
+                    group_item.setExpanded(True)
+                    group_item.setData(0, Qt.ItemDataRole.UserRole, gid)
+
+                    # 设置分组行样式
+                    font = group_item.font(1)
+                    font.setBold(True)
+                    group_item.setFont(1, font)
+
+                    # 账号子节点（先离树构建，再一次性挂到分组下）
+                    children = []
+                    add_child = children.append
+                    for account_data in account_list:
+                        browser_id = account_data.browser_id
+                        status = account_data.status
+
+                        child = QTreeWidgetItem()
+                        set_text = child.setText
+                        child.setFlags(child.flags() | checkable)
+                        child.setCheckState(0, checked)  # 默认选中
+                        set_text(1, account_data.email)
+                        set_text(2, browser_id)
+
+                        # 显示当前状态及颜色
+                        set_text(3, display_get(status, status))
+                        set_status_style(child, status)
+
+                        child.setData(0, user_role, browser_id)
+
+                        self._total_items += 1
+                        id_to_account[browser_id] = account_data
+                        item_by_browser_id[browser_id] = child
+                        add_child(child)
+
+                    group_item.addChildren(children)
+                    self._group_items.append((group_item, group_name, list(zip(children, account_list))))
+
+            except Exception as e:
+                self._log(f"❌ 显示账号失败: {e}")
+                traceback.print_exc()
+            finally:
+                self.tree.setSortingEnabled(sorting_enabled)
+
+        self._last_filter_set = None
+        self._apply_filter()
+
+    def _apply_filter(self):
+        """根据状态过滤器隐藏/显示已有节点（不重建树）"""
+        filter_set = frozenset(self._get_selected_status_filters())
+        if filter_set == self._last_filter_set:
+            return
+        self._last_filter_set = filter_set
+
+        visible_count = 0
+        with self._batch_tree_updates():
+            for group_item, group_name, rows in self._group_items:
+                visible = 0
+                for child, account_data in rows:
+                    hidden = account_data.status not in filter_set
+                    child.setHidden(hidden)
+                    # 隐藏的账号不计入已选
+                    if hidden or child.checkState(0) != Qt.CheckState.Checked:
+                        self._selected_ids.discard(account_data.browser_id)
+                    else:
+                        self._selected_ids.add(account_data.browser_id)
+                    if not hidden:
+                        visible += 1
+                group_item.setHidden(visible == 0)
+                group_item.setText(1, f"📁 {group_name} ({visible}/{len(rows)})")
+                visible_count += visible
+
+        filter_str = ", ".join(filter_set)
+        self._log(f"加载完成：{visible_count}/{self._total_items} 个账号 (过滤器: {filter_str})")
+        self._update_selection_count()
+
     def _select_all(self):
-        """全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Checked)
+        """全选（直接遍历已记录的分组节点，已选集合一次性重建）"""
+        with self._batch_tree_updates():
+            for group_item, _, _ in self._group_items:
+                group_item.setCheckState(0, Qt.CheckState.Checked)
+        self._selected_ids = {
+            account_data.browser_id
+            for _, _, rows in self._group_items
+            for child, account_data in rows
+            if not child.isHidden()
+        }
         self._update_selection_count()
 
     def _deselect_all(self):
         """取消全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Unchecked)
+        with self._batch_tree_updates():
+            for group_item, _, _ in self._group_items:
+                group_item.setCheckState(0, Qt.CheckState.Unchecked)
+        self._selected_ids = set()
+        self._update_selection_count()
+
+    def _on_item_changed(self, item: QTreeWidgetItem, column: int):
+        """勾选状态变化时增量维护已选集合"""
+        if column != 0:
+            return
+        if item.parent() is None:
+            return  # 分组节点（UserRole 为分组ID）
+        browser_id = item.data(0, Qt.ItemDataRole.UserRole)
+        if item.checkState(0) == Qt.CheckState.Checked and not item.isHidden():
+            self._selected_ids.add(browser_id)
+        else:
+            self._selected_ids.discard(browser_id)
         self._update_selection_count()
 
     def _update_selection_count(self):
         """更新已选择数量"""
-        count = len(self._get_selected_accounts())
-        self.selected_label.setText(f"已选择: {count} 个账号")
-
-    def _get_selected_accounts(self) -> list[dict]:
-        """获取选中的账号"""
-        selected = []
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    data = child.data(0, Qt.ItemDataRole.UserRole)
-                    if data and data.get("type") == "browser":
-                        selected.append(data.get("data"))
-        return selected
+        self.selected_label.setText(f"已选择: {len(self._selected_ids)} 个账号")
+
+    def _get_selected_accounts(self) -> list[AccountRow]:
+        """获取选中的账号（保持树中顺序）"""
+        selected_ids = self._selected_ids
+        return [acc for browser_id, acc in self._id_to_account.items() if browser_id in selected_ids]
 
     def _log(self, message: str):
         """添加日志"""
@@ -537,13 +785,22 @@ class GetSheerlinkAIDialog(QDialog):
         self.log_text.ensureCursorVisible()
 
     def _get_ai_config(self) -> dict:
-        """从全局配置获取 AI 配置"""
-        return {
-            'api_key': ConfigManager.get_ai_api_key() or None,
-            'base_url': ConfigManager.get_ai_base_url() or None,
-            'model': ConfigManager.get_ai_model(),
-            'max_steps': ConfigManager.get_ai_max_steps(),
-        }
+        """从全局配置获取 AI 配置（缓存，窗口重新显示时刷新）"""
+        if self._ai_config_cache is None:
+            self._ai_config_cache = {
+                'api_key': ConfigManager.get_ai_api_key() or None,
+                'base_url': ConfigManager.get_ai_base_url() or None,
+                'model': ConfigManager.get_ai_model(),
+                'max_steps': ConfigManager.get_ai_max_steps(),
+            }
+        return self._ai_config_cache
+
+    def showEvent(self, event):
+        """窗口显示时使 AI 配置缓存失效（可能已在配置管理中修改）"""
+        self._ai_config_cache = None
+        # 重新打开窗口即取消之前挂起的关闭，线程结束后正常显示汇总
+        self._close_pending = False
+        super().showEvent(event)
 
     def _start_process(self):
         """开始处理"""
@@ -582,6 +839,9 @@ class GetSheerlinkAIDialog(QDialog):
             self._log(f"API Base URL: {ai_config['base_url']}")
         self._log(f"模型: {ai_config.get('model', 'default')}")
 
+        self._counts = {"success": 0, "fail": 0, "pending": len(selected), "interrupted": 0}
+        self._last_stats = None
+
         # 禁用控件
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
@@ -595,9 +855,9 @@ class GetSheerlinkAIDialog(QDialog):
             ai_config=ai_config,
         )
         self.worker.log_signal.connect(self._log)
-        self.worker.progress_signal.connect(self._on_progress)
         self.worker.stats_signal.connect(self._on_stats)
         self.worker.finished_signal.connect(self._on_finished)
+        self._update_timer.start()
         self.worker.start()
 
     def _stop_process(self):
@@ -607,82 +867,127 @@ class GetSheerlinkAIDialog(QDialog):
             self._log("正在停止任务...")
             self.stop_btn.setEnabled(False)
 
-    def _on_progress(self, browser_id: str, status: str, message: str, link: str):
-        """进度更新"""
-        # 更新列表项状态
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.text(2) == browser_id:
-                    # 状态显示
-                    status_display = {
-                        'pending': '待处理',
-                        'subscribed': '已绑卡',
-                        'verified': '已验证',
-                        'link_ready': '待验证',
-                        'ineligible': '无资格',
-                        'error': '失败',
-                        '处理中': '处理中...',
-                    }.get(status, status)
-                    child.setText(3, status_display)
-
-                    # 链接
-                    if link:
-                        child.setText(4, link[:50] + "..." if len(link) > 50 else link)
-
-                    # 颜色
-                    if status == "subscribed":
-                        child.setBackground(3, QColor("#2196F3"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "verified":
-                        child.setBackground(3, QColor("#4CAF50"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "link_ready":
-                        child.setBackground(3, QColor("#FF9800"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "ineligible":
-                        child.setBackground(3, QColor("#9E9E9E"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "error":
-                        child.setBackground(3, QColor("#f44336"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "pending":
-                        child.setBackground(3, QColor("#607D8B"))
-                        child.setForeground(3, QColor("#ffffff"))
-                    elif status == "处理中":
-                        child.setForeground(3, QColor("#FF9800"))
-                    return
-
-    def _on_stats(self, stats: dict):
-        """统计更新"""
-        self.stats_label.setText(
-            f"📊 总计: {stats.get('total', 0)} | "
-            f"💳 已绑卡: {stats.get('subscribed', 0)} | "
-            f"✅ 已验证: {stats.get('verified', 0)} | "
-            f"🔗 待验证: {stats.get('link_ready', 0)} | "
-            f"❌ 无资格: {stats.get('ineligible', 0)} | "
-            f"⚠️ 错误: {stats.get('error', 0)}"
-        )
+    def _flush_updates(self):
+        """批量应用工作线程发件箱中的进度更新"""
+        if self.worker is None:
+            return
+        updates = self.worker.drain_progress()
+        if not updates:
+            return
+        with self._batch_tree_updates():
+            apply_progress = self._apply_progress
+            for update in updates:
+                apply_progress(*update)
+
+    def _apply_progress(self, browser_id: str, status: str, message: str, link: str):
+        """更新单个账号行的状态"""
+        child = self._item_by_browser_id.get(browser_id)
+        if child is None:
+            return
+
+        # 状态显示
+        child.setText(3, _PROGRESS_STATUS_DISPLAY.get(status, status))
+
+        if status in _RESULT_STATUSES:
+            # 结果状态：从待处理移入对应分类
+            self._counts[_STATUS_BUCKET[status]] += 1
+            self._counts["pending"] -= 1
+
+            # 同步内存中的账号状态，切换过滤器时无需重新读库
+            account_data = self._id_to_account.get(browser_id)
+            if account_data is not None:
+                account_data.status = status
+
+        # 链接
+        if link:
+            child.setText(4, link[:50] + "..." if len(link) > 50 else link)
+
+        # 颜色
+        _set_status_style(child, status)
+
+    def _on_stats(self, stats: Stats):
+        """统计更新（先缓存，由定时器合并刷新）"""
+        self._pending_stats = stats
+        if not self._stats_timer.isActive():
+            self._stats_timer.start()
+
+    def _flush_stats(self):
+        """渲染最新的统计信息"""
+        stats = self._pending_stats
+        if stats is None:
+            return
+        self._pending_stats = None
+        if stats == self._last_stats:
+            return
+        self._last_stats = stats
+        self.stats_label.setText(_STATS_TMPL.format(s=stats))
 
     def _on_finished(self):
         """处理完成"""
+        self._update_timer.stop()
+        self._flush_updates()
+        self._stats_timer.stop()
+        self._flush_stats()
+
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.refresh_btn.setEnabled(True)
 
+        # 用户停止时，未处理的账号计为中断
+        counts = self._counts
+        if self.worker.isInterruptionRequested():
+            counts["interrupted"] += counts["pending"]
+            counts["pending"] = 0
+
+        self._release_worker()
+
         self._log("=" * 50)
         self._log("任务执行完成！")
 
-        QMessageBox.information(self, "完成", "AI SheerLink 检测任务已完成")
+        if self._close_pending:
+            # 用户已请求关闭窗口，线程结束后直接关闭，不再弹窗
+            self._close_pending = False
+            self.close()
+            return
+
+        # 没有任何账号得出结果（例如启动后立即停止）时只记日志，不弹窗
+        if not (counts["success"] or counts["fail"]):
+            return
+
+        msg = _DONE_TMPL.format(s=counts['success'], f=counts['fail'])
+        if counts["interrupted"]:
+            msg += f"\n中断: {counts['interrupted']} 个"
+        if counts["pending"]:
+            msg += f"\n未完成: {counts['pending']} 个"
+        QMessageBox.information(self, "完成", msg)
+
+    def _release_worker(self):
+        """断开工作线程信号并交由 Qt 在下一轮事件循环释放，避免多次执行后旧线程对象累积"""
+        worker = self.worker
         self.worker = None
+        # finished_signal 在 run() 返回前发出，先等待线程真正退出再释放
+        worker.wait()
+        for signal, slot in (
+            (worker.log_signal, self._log),
+            (worker.stats_signal, self._on_stats),
+            (worker.finished_signal, self._on_finished),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        worker.deleteLater()
 
     def closeEvent(self, event):
-        """关闭窗口时停止工作线程"""
+        """关闭窗口时停止工作线程；不在界面线程上等待，先隐藏窗口，线程结束后由 _on_finished 完成关闭"""
         if self.worker and self.worker.isRunning():
             self.worker.stop()
-            self.worker.wait(3000)
+            self._close_pending = True
+            self.stop_btn.setEnabled(False)
+            self._log("正在等待进行中的账号结束，完成后自动关闭窗口...")
+            self.hide()
+            event.ignore()
+            return
         event.accept()
 
 
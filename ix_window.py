@@ -4,23 +4,34 @@ ixBrowser 窗口管理模块
 """
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from ixbrowser_local_api import IXBrowserClient
 from ixbrowser_local_api.entities import Profile, Proxy
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
-# 全局客户端
-_client = None
+# 每个线程各自的客户端：SDK 的 code/message/total 只反映最近一次调用，不能跨线程共享
+_local = threading.local()
+
+# 保护名称索引内容与创建中集合：查重和占用必须作为一步完成
+_index_lock = threading.Lock()
+_creating = set()  # 正在创建窗口的账号邮箱
+
+# 批量创建窗口时的并发数（受 ixBrowser 本地 API 并发能力限制）
+CREATE_MAX_WORKERS = 5
+# 批量删除窗口时的并发数
+DELETE_MAX_WORKERS = 8
 
 
 def get_client() -> IXBrowserClient:
-    """获取或创建客户端实例"""
-    global _client
-    if _client is None:
-        _client = IXBrowserClient()
-    return _client
+    """获取或创建当前线程的客户端实例"""
+    client = getattr(_local, 'client', None)
+    if client is None:
+        client = _local.client = IXBrowserClient()
+    return client
 
 
 def get_browser_list(page: int = 1, limit: int = 100, group_id: int = 0, fetch_all: bool = True) -> list:
@@ -47,27 +58,89 @@ def get_browser_list(page: int = 1, limit: int = 100, group_id: int = 0, fetch_a
         return data
 
     # 自动分页获取全部数据
-    all_browsers = []
-    current_page = 1
+    return list(iter_browsers(page_size=limit, group_id=group_id))
+
+
+def iter_browsers(page_size: int = 200, group_id: int = 0):
+    """
+    逐页获取窗口并逐个产出，调用方可提前结束遍历，无需一次载入全部列表
+
+    Args:
+        page_size: 每页数量
+        group_id: 分组ID (0=全部)
+
+    Yields:
+        窗口信息字典
+    """
+    client = get_client()
+    page = 1
 
     while True:
-        data = client.get_profile_list(page=current_page, limit=limit, group_id=group_id)
+        data = client.get_profile_list(page=page, limit=page_size, group_id=group_id)
 
         if data is None:
             print(f"获取列表失败: {client.message}")
-            break
+            return
 
         if not data:
             # 没有更多数据
-            break
+            return
 
-        all_browsers.extend(data)
+        yield from data
 
-        if len(data) < limit:
+        if len(data) < page_size:
             # 当前页数据不足，说明已是最后一页
-            break
+            return
+
+        page += 1
+
+
+def get_browser_list_parallel(limit: int = 200, group_id: int = 0, max_workers: int = 4) -> list:
+    """
+    并发分页获取全部窗口列表
+
+    每轮同时请求 max_workers 页，直到某页数据不足 limit（最后一页）为止，
+    结果按页码顺序拼接
+
+    Args:
+        limit: 每页数量
+        group_id: 分组ID (0=全部)
+        max_workers: 每轮并发请求的页数
+
+    Returns:
+        窗口列表
+    """
+    def fetch_page(page: int):
+        # 在线程池线程内取各自的客户端，失败信息不会被其他页的请求覆盖
+        client = get_client()
+        data = client.get_profile_list(page=page, limit=limit, group_id=group_id)
+        if data is None:
+            print(f"获取列表失败: {client.message}")
+        return data
+
+    all_browsers = []
+    next_page = 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            pages = range(next_page, next_page + max_workers)
+            finished = False
+
+            for data in executor.map(fetch_page, pages):
+                if data is None:
+                    finished = True
+                    break
 
-        current_page += 1
+                all_browsers.extend(data)
+
+                if len(data) < limit:
+                    # 当前页数据不足，说明已是最后一页
+                    finished = True
+                    break
+
+            if finished:
+                break
+            next_page += max_workers
 
     return all_browsers
 
@@ -91,6 +164,51 @@ def get_browser_info(profile_id: int) -> dict:
     return data[0]
 
 
+def build_browser_name_index() -> dict:
+    """
+    按当前窗口列表构建 名称/用户名 -> 窗口 的索引（同名时保留列表中靠前的窗口）
+
+    批量创建时由调用方构建一次并传给每次 create_browser_window，
+    只在本批次内复用，不做跨批次缓存
+    """
+    index = {}
+    for browser in get_browser_list(limit=1000):
+        for key in (browser.get('name'), browser.get('username')):
+            if key and key not in index:
+                index[key] = browser
+    return index
+
+
+def _claim_browser_name(index: dict, email: str) -> str:
+    """
+    查重并占用账号邮箱，防止并发创建同一账号的窗口
+
+    Returns:
+        已存在或正在创建时返回错误信息，占用成功返回 None
+    """
+    if not email:
+        return None
+    with _index_lock:
+        b = index.get(email)
+        if b is not None:
+            return f"该账号已有对应窗口: {b.get('name')} (ID: {b.get('profile_id')})"
+        if email in _creating:
+            return f"该账号的窗口正在创建中: {email}"
+        _creating.add(email)
+    return None
+
+
+def _release_browser_name(index: dict, email: str, name: str, profile_id):
+    """释放占用；创建成功时将新窗口写入本批次的名称索引，后续查重无需重新拉取列表"""
+    with _index_lock:
+        _creating.discard(email)
+        if profile_id:
+            browser = {'name': name, 'username': email, 'profile_id': profile_id}
+            for key in (name, email):
+                if key:
+                    index.setdefault(key, browser)
+
+
 def delete_browsers_by_name(name_pattern: str) -> int:
     """
     根据名称删除所有匹配的窗口
@@ -101,18 +219,19 @@ def delete_browsers_by_name(name_pattern: str) -> int:
     Returns:
         删除的窗口数量
     """
-    client = get_client()
-    browsers = get_browser_list(limit=1000)
-    deleted_count = 0
+    # 先收集匹配的窗口再删除，避免边删边翻页导致漏删
+    profile_ids = [b.get('profile_id') for b in iter_browsers() if b.get('name') == name_pattern]
+    if not profile_ids:
+        return 0
 
-    for browser in browsers:
-        if browser.get('name') == name_pattern:
-            profile_id = browser.get('profile_id')
-            result = client.delete_profile(profile_id)
-            if result is not None:
-                deleted_count += 1
+    def delete_one(profile_id):
+        # 在线程池线程内取各自的客户端，不与其他删除请求共享状态
+        return get_client().delete_profile(profile_id)
 
-    return deleted_count
+    # 删除请求互不依赖，并发提交
+    with ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS) as executor:
+        results = list(executor.map(delete_one, profile_ids))
+    return sum(1 for result in results if result is not None)
 
 
 def open_browser_by_id(profile_id: int) -> bool:
@@ -147,20 +266,15 @@ def get_next_window_name(prefix: str) -> str:
     Returns:
         下一个窗口名称，如 "美国_1"
     """
-    browsers = get_browser_list(limit=1000)
-    max_num = 0
-
     prefix_pattern = f"{prefix}_"
-    for browser in browsers:
-        name = browser.get('name', '')
-        if name.startswith(prefix_pattern):
-            try:
-                suffix = name[len(prefix_pattern):]
-                num = int(suffix)
-                if num > max_num:
-                    max_num = num
-            except:
-                pass
+    prefix_len = len(prefix_pattern)
+    # isdecimal 过滤非数字后缀，避免逐个窗口走 int() 异常分支
+    suffixes = (
+        name[prefix_len:]
+        for name in (browser.get('name') or '' for browser in iter_browsers())
+        if name.startswith(prefix_pattern)
+    )
+    max_num = max((int(suffix) for suffix in suffixes if suffix.isdecimal()), default=0)
 
     return f"{prefix}_{max_num + 1}"
 
@@ -192,7 +306,8 @@ def open_browser_url(profile_id: int, target_url: str):
 
 def create_browser_window(account: dict, reference_profile_id: int = None,
                           proxy: dict = None, name_prefix: str = None,
-                          template_config: dict = None, group_id: int = 1):
+                          template_config: dict = None, group_id: int = 1,
+                          name_index: dict = None):
     """
     创建新的浏览器窗口
 
@@ -203,6 +318,8 @@ def create_browser_window(account: dict, reference_profile_id: int = None,
         name_prefix: 窗口名称前缀
         template_config: 模板配置 (未使用，保留兼容性)
         group_id: 分组ID
+        name_index: 本批次的窗口名称索引 (build_browser_name_index)；
+            为 None 时按当前窗口列表实时查重
 
     Returns:
         (profile_id, error_message)
@@ -211,17 +328,30 @@ def create_browser_window(account: dict, reference_profile_id: int = None,
     if group_id is None:
         group_id = 1
 
+    # 检查是否已存在该账号的窗口（并占用，直到本次创建结束）
+    if name_index is None:
+        name_index = build_browser_name_index()
+    email = account['email']
+    error = _claim_browser_name(name_index, email)
+    if error:
+        return None, error
+
+    new_profile_id = None
+    new_name = email if email else get_next_window_name(name_prefix or "Profile")
+    try:
+        new_profile_id, error = _create_profile(account, new_name, reference_profile_id, proxy, group_id)
+    finally:
+        _release_browser_name(name_index, email, new_name, new_profile_id)
+    return new_profile_id, error
+
+
+def _create_profile(account: dict, new_name: str, reference_profile_id: int,
+                    proxy: dict, group_id: int):
+    """实际创建窗口（复制参考窗口或新建），返回 (profile_id, error_message)"""
     client = get_client()
 
-    # 检查是否已存在该账号的窗口
-    all_browsers = get_browser_list(limit=1000)
-    for b in all_browsers:
-        if b.get('name') == account['email'] or b.get('username') == account['email']:
-            return None, f"该账号已有对应窗口: {b.get('name')} (ID: {b.get('profile_id')})"
-
     # 如果有参考窗口，使用复制功能
     if reference_profile_id:
-        new_name = account['email'] if account.get('email') else get_next_window_name(name_prefix or "Profile")
         result = client.create_profile_by_copying(
             profile_id=reference_profile_id,
             name=new_name,
@@ -263,7 +393,7 @@ def create_browser_window(account: dict, reference_profile_id: int = None,
 
     # 创建新窗口
     profile = Profile()
-    profile.name = account['email'] if account.get('email') else get_next_window_name(name_prefix or "Profile")
+    profile.name = new_name
     profile.note = account.get('full_line', '')
     profile.username = account.get('email', '')
     profile.password = account.get('password', '')
@@ -342,24 +472,32 @@ def main():
         reference_profile_id = browsers[0].get('profile_id')
         print(f"使用第一个窗口作为模板: ID={reference_profile_id}")
 
+        # 创建窗口均为本地 API 的 I/O 请求，用线程池并发提交
         success_count = 0
-        for i, account in enumerate(accounts[:3], 1):  # 只测试前3个
-            proxy = proxies[i - 1] if i - 1 < len(proxies) else None
-            profile_id, error = create_browser_window(
-                account,
-                reference_profile_id=reference_profile_id,
-                proxy=proxy
-            )
-            if profile_id:
-                success_count += 1
-                print(f"创建成功: {account['email']} -> ID={profile_id}")
-            else:
-                print(f"创建失败: {error}")
-
-            if i < len(accounts):
-                time.sleep(1)
-
-        print(f"完成: {success_count}/{min(3, len(accounts))}")
+        test_accounts = accounts[:3]  # 只测试前3个
+        # 本批次共用一份名称索引：查重只拉取一次窗口列表，批内新建的窗口也会写入
+        name_index = build_browser_name_index()
+        with ThreadPoolExecutor(max_workers=CREATE_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    create_browser_window,
+                    account,
+                    reference_profile_id=reference_profile_id,
+                    proxy=proxies[i] if i < len(proxies) else None,
+                    name_index=name_index
+                ): account
+                for i, account in enumerate(test_accounts)
+            }
+            for future in as_completed(futures):
+                account = futures[future]
+                profile_id, error = future.result()
+                if profile_id:
+                    success_count += 1
+                    print(f"创建成功: {account['email']} -> ID={profile_id}")
+                else:
+                    print(f"创建失败: {error}")
+
+        print(f"完成: {success_count}/{len(test_accounts)}")
 
 
 if __name__ == "__main__":
@@ -31,17 +31,19 @@ def migrate():
             
         print(f"正在处理: {filename} (状态: {status})...")
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                lines = [l.strip() for l in f.readlines() if l.strip()]
-            
             count = 0
-            for line in lines:
-                # 使用 AccountManager 的解析逻辑
-                email, pwd, rec, sec, link = AccountManager._parse(line)
-                if email:
-                    # 插入数据库
-                    DBManager.upsert_account(email, pwd, rec, sec, link, status=status)
-                    count += 1
+            # 逐行流式读取，不先把整个文件读入列表
+            with open(path, 'r', encoding='utf-8') as f:
+                for raw in f:
+                    line = raw.strip()
+                    if not line:
+                        continue
+                    # 使用 AccountManager 的解析逻辑
+                    email, pwd, rec, sec, link = AccountManager._parse(line)
+                    if email:
+                        # 插入数据库
+                        DBManager.upsert_account(email, pwd, rec, sec, link, status=status)
+                        count += 1
             
             print(f"  -> 成功导入 {count} 条数据")
             total_count += count
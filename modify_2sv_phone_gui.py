@@ -35,6 +35,17 @@ from database import DBManager
 from core.config_manager import ConfigManager
 from auto_modify_2sv_phone import auto_modify_2sv_phone
 
+# uvloop 为可选依赖（仅 Linux/macOS 可用），安装后工作线程使用更快的事件循环
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# 复用的画刷，避免每次进度更新重新创建
+_GRAY_BRUSH = QBrush(QColor(150, 150, 150))
+_SUCCESS_BRUSH = QBrush(Qt.GlobalColor.green)
+_FAIL_BRUSH = QBrush(Qt.GlobalColor.red)
+
 
 class Modify2SVPhoneWorker(QThread):
     """后台工作线程"""
@@ -65,13 +76,27 @@ class Modify2SVPhoneWorker(QThread):
         self.log_signal.emit(message)
 
     def run(self):
+        # 只为本线程创建事件循环，不修改全局事件循环策略
+        loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
         try:
-            asyncio.run(self._process_all())
+            loop.run_until_complete(self._process_all())
         except Exception as e:
             self._log(f"❌ 工作线程异常: {e}")
             traceback.print_exc()
         finally:
-            self.finished_signal.emit()
+            try:
+                # 与 asyncio.run 一致：清理残留任务后关闭事件循环
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+                self.finished_signal.emit()
 
     async def _process_all(self):
         if not self.accounts:
@@ -141,6 +166,8 @@ class Modify2SVPhoneDialog(QDialog):
         self.worker = None
         self.db_manager = DBManager()
         self.accounts = []
+        self._browser_id_to_item = {}  # browser_id -> 账号节点
+        self._selected_ids = set()  # 已勾选账号的 browser_id
         self.modification_history = {}  # 保存已修改账户的历史记录
         self.current_new_phone = ""  # 当前操作的新手机号
 
@@ -219,7 +246,7 @@ class Modify2SVPhoneDialog(QDialog):
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.tree.setRootIsDecorated(True)
         self.tree.setIndentation(15)
-        self.tree.itemChanged.connect(lambda: self._update_selection_count())
+        self.tree.itemChanged.connect(self._on_item_changed)
         list_layout.addWidget(self.tree)
 
         layout.addWidget(list_group)
@@ -257,10 +284,15 @@ class Modify2SVPhoneDialog(QDialog):
         """从浏览器列表加载账号（按分组显示）"""
         self.tree.clear()
         self.accounts = []
+        self._browser_id_to_item = {}
+        self._selected_ids = set()  # 新建节点默认不选中
 
         # 加载已修改历史记录
         self.modification_history = self.db_manager.get_2sv_phone_modification_history()
 
+        # 构建期间暂停重绘并屏蔽 itemChanged，避免每个节点触发一次刷新
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
         try:
             # 获取数据库账号
             db_accounts = self.db_manager.get_all_accounts()
@@ -299,13 +331,12 @@ class Modify2SVPhoneDialog(QDialog):
                 browser_id = browser.get('id', '') or browser.get('profile_id', '')
                 browser_name = browser.get('name', '')
 
-                # 从名称或备注中提取邮箱
-                email = browser_name
+                # 从名称或备注中提取邮箱（partition 一次扫描同时完成查找与切分）
                 note = browser.get('note', '') or ''
-                if '----' in note:
-                    email = note.split('----')[0].strip()
-                elif '----' in browser_name:
-                    email = browser_name.split('----')[0].strip()
+                head, sep, _ = note.partition('----')
+                if not sep:
+                    head, sep, _ = browser_name.partition('----')
+                email = head.strip() if sep else browser_name
 
                 if '@' not in email:
                     continue
@@ -323,6 +354,7 @@ class Modify2SVPhoneDialog(QDialog):
             # 创建树形结构
             total_count = 0
             modified_count = 0
+            group_items = []
             for gid in sorted(grouped.keys()):
                 account_list = grouped[gid]
                 if not account_list:
@@ -331,16 +363,13 @@ class Modify2SVPhoneDialog(QDialog):
                 group_name = group_names.get(gid, f"分组 {gid}")
 
                 # 分组节点
-                group_item = QTreeWidgetItem(self.tree)
-                group_item.setText(0, "")
-                group_item.setText(1, f"📁 {group_name} ({len(account_list)})")
+                group_item = QTreeWidgetItem(["", f"📁 {group_name} ({len(account_list)})"])
                 group_item.setFlags(
                     group_item.flags() |
                     Qt.ItemFlag.ItemIsAutoTristate |
                     Qt.ItemFlag.ItemIsUserCheckable
                 )
                 group_item.setCheckState(0, Qt.CheckState.Unchecked)
-                group_item.setExpanded(True)
                 group_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "group", "id": gid})
 
                 # 设置分组行样式
@@ -348,74 +377,85 @@ class Modify2SVPhoneDialog(QDialog):
                 font.setBold(True)
                 group_item.setFont(1, font)
 
-                # 账号子节点
+                # 账号子节点：先离线创建，再一次性挂到分组下
+                children = []
                 for account in account_list:
-                    child = QTreeWidgetItem(group_item)
-                    child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                    child.setCheckState(0, Qt.CheckState.Unchecked)  # 默认不选中
-                    child.setText(1, account["email"])
-                    child.setText(2, account["browser_id"])
-
-                    # 检查是否已修改过
                     email = account["email"]
-                    if email in self.modification_history:
-                        history = self.modification_history[email]
-                        child.setText(3, "已修改")
+                    history = self.modification_history.get(email)
+                    if history is not None:
                         # 显示修改后的新手机号
-                        child.setText(4, f"→ {history['new_phone']}")
-
+                        child = QTreeWidgetItem(["", email, account["browser_id"], "已修改", f"→ {history['new_phone']}"])
                         # 设置置灰样式
-                        gray_color = QColor(150, 150, 150)
-                        gray_brush = QBrush(gray_color)
                         for col in range(5):
-                            child.setForeground(col, gray_brush)
-
+                            child.setForeground(col, _GRAY_BRUSH)
                         modified_count += 1
                     else:
-                        child.setText(3, "待处理")
-                        child.setText(4, "")
-
+                        child = QTreeWidgetItem(["", email, account["browser_id"], "待处理", ""])
+                    child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                    child.setCheckState(0, Qt.CheckState.Unchecked)  # 默认不选中
                     child.setData(0, Qt.ItemDataRole.UserRole, {
                         "type": "browser",
                         "account": account
                     })
                     self.accounts.append(account)
+                    self._browser_id_to_item[account["browser_id"]] = child
+                    children.append(child)
                     total_count += 1
 
+                group_item.addChildren(children)
+                group_items.append(group_item)
+
+            self.tree.addTopLevelItems(group_items)
+            # 展开状态只能在节点挂到树上之后设置
+            for group_item in group_items:
+                group_item.setExpanded(True)
+
             self._update_selection_count()
             self._log(f"已加载 {total_count} 个账号（已修改: {modified_count} 个）")
 
         except Exception as e:
             self._log(f"❌ 加载账号失败: {e}")
             traceback.print_exc()
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
 
     def _select_all(self):
-        """全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Checked)
+        """全选（屏蔽逐项信号，已选集合一次性设置）"""
+        self._set_all_checked(Qt.CheckState.Checked)
+        self._selected_ids = set(self._browser_id_to_item)
         self._update_selection_count()
 
     def _deselect_all(self):
         """取消全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Unchecked)
+        self._set_all_checked(Qt.CheckState.Unchecked)
+        self._selected_ids = set()
+        self._update_selection_count()
+
+    def _set_all_checked(self, state: Qt.CheckState):
+        """设置全部分组节点的勾选状态（自动三态会同步到子节点）"""
+        self.tree.blockSignals(True)
+        try:
+            root = self.tree.invisibleRootItem()
+            for i in range(root.childCount()):
+                root.child(i).setCheckState(0, state)
+        finally:
+            self.tree.blockSignals(False)
+
+    def _on_item_changed(self, item: QTreeWidgetItem, column: int):
+        """勾选状态变化时增量维护已选集合"""
+        if column != 0 or item.parent() is None:
+            return  # 只处理账号节点的勾选列
+        browser_id = item.text(2)
+        if item.checkState(0) == Qt.CheckState.Checked:
+            self._selected_ids.add(browser_id)
+        else:
+            self._selected_ids.discard(browser_id)
         self._update_selection_count()
 
     def _update_selection_count(self):
         """更新选中数量"""
-        count = 0
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    count += 1
-        self.selected_label.setText(f"已选择: {count} 个账号")
+        self.selected_label.setText(f"已选择: {len(self._selected_ids)} 个账号")
 
     def _get_selected_accounts(self) -> list[dict]:
         """获取选中的账号列表"""
@@ -513,41 +553,36 @@ class Modify2SVPhoneDialog(QDialog):
 
     def _on_progress(self, browser_id: str, status: str, message: str):
         """处理进度更新"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.text(2) == browser_id:
-                    child.setText(3, status)
-                    child.setText(4, message)
-
-                    # 根据状态设置颜色
-                    if status == "成功":
-                        child.setBackground(3, Qt.GlobalColor.green)
-
-                        # 保存修改记录到数据库
-                        data = child.data(0, Qt.ItemDataRole.UserRole)
-                        if data and data.get("type") == "browser":
-                            email = data.get("account", {}).get("email", "")
-                            if email and self.current_new_phone:
-                                self.db_manager.add_2sv_phone_modification(email, self.current_new_phone)
-                                # 更新本地缓存
-                                self.modification_history[email] = {
-                                    'new_phone': self.current_new_phone,
-                                    'modified_at': 'now'
-                                }
-                                # 更新显示
-                                child.setText(4, f"→ {self.current_new_phone}")
-                                # 设置置灰样式（跳过状态列，保留绿色背景的可读性）
-                                gray_color = QColor(150, 150, 150)
-                                gray_brush = QBrush(gray_color)
-                                for col in [0, 1, 2, 4]:  # 跳过状态列(3)
-                                    child.setForeground(col, gray_brush)
-
-                    elif status == "失败" or status == "错误":
-                        child.setBackground(3, Qt.GlobalColor.red)
-                    return
+        child = self._browser_id_to_item.get(browser_id)
+        if child is None:
+            return
+
+        child.setText(3, status)
+        child.setText(4, message)
+
+        # 根据状态设置颜色
+        if status == "成功":
+            child.setBackground(3, _SUCCESS_BRUSH)
+
+            # 保存修改记录到数据库
+            data = child.data(0, Qt.ItemDataRole.UserRole)
+            if data and data.get("type") == "browser":
+                email = data.get("account", {}).get("email", "")
+                if email and self.current_new_phone:
+                    self.db_manager.add_2sv_phone_modification(email, self.current_new_phone)
+                    # 更新本地缓存
+                    self.modification_history[email] = {
+                        'new_phone': self.current_new_phone,
+                        'modified_at': 'now'
+                    }
+                    # 更新显示
+                    child.setText(4, f"→ {self.current_new_phone}")
+                    # 设置置灰样式（跳过状态列，保留绿色背景的可读性）
+                    for col in (0, 1, 2, 4):  # 跳过状态列(3)
+                        child.setForeground(col, _GRAY_BRUSH)
+
+        elif status == "失败" or status == "错误":
+            child.setBackground(3, _FAIL_BRUSH)
 
     def _on_finished(self):
         """处理完成"""
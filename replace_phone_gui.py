@@ -4,10 +4,19 @@
 
 使用 AI Agent 模式（Gemini Vision）
 AI 配置请在「配置管理 → 全局设置」中设置
+
+性能说明：本窗口没有数值计算热点，耗时主要在 ixBrowser/数据库请求（已放到
+LoadDataWorker 并发执行）和 QTreeWidget 建树（已分批、屏蔽信号构建），
+JIT/向量化对这类界面胶水代码没有收益。调整前请先用 --profile 运行测量界面线程耗时。
 """
+import re
 import sys
 import asyncio
 import traceback
+from dataclasses import dataclass
+from itertools import groupby
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt6.QtWidgets import (
     QDialog,
@@ -26,7 +35,7 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QAbstractItemView,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QCoreApplication, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QColor, QBrush
 
 from ix_api import get_group_list
@@ -35,6 +44,37 @@ from database import DBManager
 from core.config_manager import ConfigManager
 from auto_replace_recovery_phone import auto_replace_recovery_phone
 
+# 不可显示字符（控制字符、格式字符、非空格分隔符），用于清理分组名称
+_NON_PRINTABLE_RE = re.compile(r'[\x00-\x1f\x7f-\xa0\xad\u2000-\u200f\u2028-\u202f\u205f-\u2064\u3000\ufeff]+')
+
+
+# 名称/备注中 "邮箱----..." 格式的邮箱部分（取第一个分隔符之前的内容）
+_EMAIL_SPLIT_RE = re.compile(r'(.*?)----', re.DOTALL)
+
+
+@dataclass(slots=True)
+class AccountRow:
+    """账号列表中的一行（浏览器窗口 + 数据库账号信息）"""
+    browser_id: str
+    email: str
+    password: str
+    secret: str
+    group_id: int
+
+
+# 状态/已修改行配色，只创建一次
+_GRAY_BRUSH = QBrush(QColor(150, 150, 150))
+_SUCCESS_BRUSH = QBrush(Qt.GlobalColor.green)
+_FAIL_BRUSH = QBrush(Qt.GlobalColor.red)
+
+
+def _clean_group_name(name, gid) -> str:
+    """清理分组名称中的不可显示字符，清理后为空或含乱码时使用默认名称"""
+    clean_name = _NON_PRINTABLE_RE.sub('', str(name))
+    if not clean_name or '\ufffd' in clean_name:
+        clean_name = f"分组 {gid}"
+    return clean_name
+
 
 class ReplacePhoneWorker(QThread):
     """后台工作线程"""
@@ -44,7 +84,7 @@ class ReplacePhoneWorker(QThread):
 
     def __init__(
         self,
-        accounts: list[dict],
+        accounts: list[AccountRow],
         new_phone: str,
         thread_count: int,
         close_after: bool,
@@ -69,7 +109,7 @@ class ReplacePhoneWorker(QThread):
             asyncio.run(self._process_all())
         except Exception as e:
             self._log(f"❌ 工作线程异常: {e}")
-            traceback.print_exc()
+            self._log(traceback.format_exc())
         finally:
             self.finished_signal.emit()
 
@@ -80,56 +120,174 @@ class ReplacePhoneWorker(QThread):
 
         self._log(f"开始处理 {len(self.accounts)} 个账号，并发数: {self.thread_count}")
 
-        # 使用信号量控制并发
-        semaphore = asyncio.Semaphore(self.thread_count)
-
-        async def process_one(index: int, account: dict):
-            async with semaphore:
-                if not self.is_running:
-                    return
-
-                browser_id = account.get('browser_id', '')
-                email = account.get('email', 'Unknown')
-
-                self._log(f"[{index + 1}] 开始替换辅助手机号: {email} ({browser_id})")
-                self.progress_signal.emit(browser_id, "处理中", "正在替换...")
-
-                try:
-                    account_info = {
-                        'email': account.get('email', ''),
-                        'password': account.get('password', ''),
-                        'secret': account.get('secret', ''),
-                    }
-
-                    success, msg = await auto_replace_recovery_phone(
-                        browser_id,
-                        account_info,
-                        self.new_phone,
-                        self.close_after,
-                        api_key=self.ai_config.get('api_key'),
-                        base_url=self.ai_config.get('base_url'),
-                        model=self.ai_config.get('model', 'gemini-2.5-flash'),
-                        max_steps=self.ai_config.get('max_steps', 25),
-                    )
-
-                    if success:
-                        self._log(f"[{index + 1}] ✅ {email}: {msg}")
-                        self.progress_signal.emit(browser_id, "成功", msg)
-                    else:
-                        self._log(f"[{index + 1}] ❌ {email}: {msg}")
-                        self.progress_signal.emit(browser_id, "失败", msg)
-
-                except Exception as e:
-                    self._log(f"[{index + 1}] ❌ {email}: {e}")
-                    self.progress_signal.emit(browser_id, "错误", str(e))
-
-        # 并发执行
-        tasks = [process_one(i, acc) for i, acc in enumerate(self.accounts)]
-        await asyncio.gather(*tasks)
+        async def process_one(index: int, account: AccountRow):
+            if not self.is_running:
+                return
+
+            browser_id = account.browser_id
+            email = account.email or 'Unknown'
+
+            self._log(f"[{index + 1}] 开始替换辅助手机号: {email} ({browser_id})")
+            self.progress_signal.emit(browser_id, "处理中", "正在替换...")
+
+            try:
+                account_info = {
+                    'email': account.email,
+                    'password': account.password,
+                    'secret': account.secret,
+                }
+
+                success, msg = await auto_replace_recovery_phone(
+                    browser_id,
+                    account_info,
+                    self.new_phone,
+                    self.close_after,
+                    api_key=self.ai_config.get('api_key'),
+                    base_url=self.ai_config.get('base_url'),
+                    model=self.ai_config.get('model', 'gemini-2.5-flash'),
+                    max_steps=self.ai_config.get('max_steps', 25),
+                )
+
+                if success:
+                    self._log(f"[{index + 1}] ✅ {email}: {msg}")
+                    self.progress_signal.emit(browser_id, "成功", msg)
+                else:
+                    self._log(f"[{index + 1}] ❌ {email}: {msg}")
+                    self.progress_signal.emit(browser_id, "失败", msg)
+
+            except Exception as e:
+                self._log(f"[{index + 1}] ❌ {email}: {e}")
+                self.progress_signal.emit(browser_id, "错误", str(e))
+
+        # 任务队列 + 固定数量的 worker 控制并发，同时存在的协程数只与并发数相关
+        queue = asyncio.Queue()
+        for item in enumerate(self.accounts):
+            queue.put_nowait(item)
+
+        async def worker():
+            while self.is_running and not queue.empty():
+                index, account = queue.get_nowait()
+                await process_one(index, account)
+
+        worker_count = min(self.thread_count, len(self.accounts))
+        results = await asyncio.gather(*[worker() for _ in range(worker_count)], return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self._log(f"❌ 工作协程异常: {result}")
 
         self._log("✅ 所有账号处理完成")
 
 
+class LoadDataWorker(QThread):
+    """后台加载账号数据（修改历史、数据库账号、分组列表、浏览器列表），按分组分批发送到界面"""
+    history_signal = pyqtSignal(dict)  # 已修改历史记录 {email: {new_phone, modified_at}}
+    batch_signal = pyqtSignal(int, str, list)  # 分组ID, 分组名称, [(账号数据, 状态文本, 消息文本, 是否已修改)]
+    finished_signal = pyqtSignal()
+    log_signal = pyqtSignal(str)
+
+    # 每批最多发送的账号数，大分组拆成多批，界面逐批建树
+    BATCH_SIZE = 100
+
+    def __init__(self, db_manager: DBManager):
+        super().__init__()
+        self.db_manager = db_manager
+
+    def run(self):
+        try:
+            self._load()
+        except Exception as e:
+            self.log_signal.emit(f"❌ 加载账号失败: {e}")
+            self.log_signal.emit(traceback.format_exc())
+        finally:
+            self.finished_signal.emit()
+
+    def _load(self):
+        group_names = {}
+        all_account_data = []
+
+        # 修改历史、数据库账号、分组列表、浏览器列表互不依赖，并发获取
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            history_future = executor.submit(self.db_manager.get_phone_modification_history)
+            accounts_future = executor.submit(self.db_manager.get_all_accounts)
+            groups_future = executor.submit(get_group_list)
+            browsers_future = executor.submit(get_browser_list, page=1, limit=1000)
+            # 已修改历史记录发送给界面（进度更新和清除记录时使用）
+            history = history_future.result()
+            self.history_signal.emit(history)
+            db_accounts = accounts_future.result()
+            all_groups = groups_future.result() or []
+            browsers = browsers_future.result() or []
+
+        account_map = {acc['email']: acc for acc in db_accounts}
+
+        # 分组名称
+        for g in all_groups:
+            gid = g.get('id')
+            group_names[gid] = _clean_group_name(g.get('title', ''), gid)
+        group_names[0] = "未分组"
+        group_names[1] = "默认分组"  # 确保默认分组存在
+
+        # 分组列表中没有的分组：先收集浏览器数据中的分组名（取第一个），再统一清理
+        unknown_groups = {}
+        for browser in browsers:
+            gid = browser.get('group_id', 0) or 0
+            if gid not in group_names and gid not in unknown_groups:
+                unknown_groups[gid] = browser.get('group_name', '') or ''
+        group_names.update(
+            {gid: _clean_group_name(name, gid) for gid, name in unknown_groups.items()}
+        )
+
+        # 提取账号（分组名均已知，循环内只做邮箱提取；常用方法先绑定为局部变量）
+        email_match = _EMAIL_SPLIT_RE.match
+        account_get = account_map.get
+        append = all_account_data.append
+        for browser in browsers:
+            browser_get = browser.get
+            browser_name = browser_get('name', '')
+
+            # 从名称或备注中提取邮箱
+            m = email_match(browser_get('note') or '') or email_match(browser_name)
+            email = m.group(1).strip() if m else browser_name
+
+            if '@' not in email:
+                continue
+
+            browser_id = browser_get('id') or browser_get('profile_id', '')
+
+            # 获取对应的账号信息
+            account = account_get(email)
+            if account is None:
+                password = secret = ''
+            else:
+                password = account.get('password', '')
+                secret = account.get('secret') or account.get('secret_key', '')
+            append(AccountRow(
+                browser_id=str(browser_id),
+                email=email,
+                password=password,
+                secret=secret,
+                group_id=browser_get('group_id') or 0,
+            ))
+
+        # 按分组ID稳定排序，用 groupby 单次遍历分组，逐批发送
+        # 每行的显示文本和置灰标记在此预先算好，界面线程只负责创建节点
+        by_group = attrgetter('group_id')
+        all_account_data.sort(key=by_group)
+        history_get = history.get
+        batch_size = self.BATCH_SIZE
+        for gid, rows in groupby(all_account_data, key=by_group):
+            account_list = []
+            for account_data in rows:
+                record = history_get(account_data.email)
+                if record is None:
+                    account_list.append((account_data, "待处理", "", False))
+                else:
+                    account_list.append((account_data, "已修改", f"→ {record['new_phone']}", True))
+            group_name = group_names.get(gid, f"分组 {gid}")
+            for i in range(0, len(account_list), batch_size):
+                self.batch_signal.emit(gid, group_name, account_list[i:i + batch_size])
+
+
 class ReplacePhoneWindow(QDialog):
     """替换辅助手机号主对话框"""
 
@@ -139,14 +297,44 @@ class ReplacePhoneWindow(QDialog):
         self.setMinimumSize(900, 700)
 
         self.worker = None
+        self.load_worker = None  # 账号加载线程
         self.db_manager = DBManager()
-        self.accounts = []
+        self._id_to_account = {}  # browser_id -> 账号数据（按树中顺序）
+        self._browser_id_to_item = {}  # browser_id -> 账号节点
+        self._group_item_by_gid = {}  # 分组ID -> 分组节点
+        self._modified_count = 0  # 已加载账号中已修改过的数量
+        self._selected_ids = set()  # 已勾选账号的 browser_id
         self.modification_history = {}  # 保存已修改账户的历史记录
         self.current_new_phone = ""  # 当前操作的新手机号
+        self._ai_config_cache = None  # AI 配置缓存，窗口每次显示时失效
+        self._pending_history = []  # 待写入数据库的修改记录 [(email, new_phone)]
+        self._log_buffer = []  # 待刷新到日志框的消息
+
+        # 定时批量写入修改记录，避免每个成功账号在界面线程上单独提交一次事务
+        self._history_timer = QTimer(self)
+        self._history_timer.setInterval(500)
+        self._history_timer.timeout.connect(self._flush_history)
+
+        # 并发处理时日志较密集，合并后定时刷新到日志框
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+
+        # 关闭窗口时加载线程留在后台完成；进程退出前必须等它结束，
+        # 否则 QThread 在运行中被销毁会直接中止进程
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._wait_load_worker)
 
         self._init_ui()
         self._load_accounts()
 
+    def _wait_load_worker(self):
+        """应用退出前等待账号加载线程结束"""
+        if self.load_worker is not None:
+            self.load_worker.wait()
+
     def _init_ui(self):
         layout = QVBoxLayout(self)
 
@@ -219,7 +407,9 @@ class ReplacePhoneWindow(QDialog):
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.tree.setRootIsDecorated(True)
         self.tree.setIndentation(15)
-        self.tree.itemChanged.connect(lambda: self._update_selection_count())
+        # 所有行高度一致，视图无需逐行计算尺寸，大量账号时滚动和布局更快
+        self.tree.setUniformRowHeights(True)
+        self.tree.itemChanged.connect(self._on_item_changed)
         list_layout.addWidget(self.tree)
 
         layout.addWidget(list_group)
@@ -254,195 +444,171 @@ class ReplacePhoneWindow(QDialog):
         layout.addLayout(btn_layout)
 
     def _load_accounts(self):
-        """从浏览器列表加载账号（按分组显示）"""
+        """后台加载账号，树按分组分批构建"""
+        if self.load_worker is not None:
+            return  # 正在加载
+
+        self._id_to_account = {}
+        self._browser_id_to_item = {}
+        self._group_item_by_gid = {}
+        self._selected_ids = set()  # 新建节点默认不选中
+        self._modified_count = 0
         self.tree.clear()
-        self.accounts = []
-
-        # 加载已修改历史记录
-        self.modification_history = self.db_manager.get_phone_modification_history()
-
+        self._update_selection_count()
+        self.refresh_btn.setEnabled(False)
+
+        self.load_worker = LoadDataWorker(self.db_manager)
+        self.load_worker.history_signal.connect(self._on_history_loaded)
+        self.load_worker.batch_signal.connect(self._on_group_batch)
+        self.load_worker.finished_signal.connect(self._on_load_finished)
+        self.load_worker.log_signal.connect(self._log)
+        self.load_worker.start()
+
+    def _on_history_loaded(self, history: dict):
+        """已修改历史记录加载完成"""
+        self.modification_history = history
+
+    def _on_group_batch(self, gid: int, group_name: str, account_list: list):
+        """将一批账号挂到分组节点下（离树构建子节点后一次性挂载）"""
+        # 批量构建期间暂停重绘和信号
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
         try:
-            # 获取数据库账号
-            db_accounts = self.db_manager.get_all_accounts()
-            account_map = {acc['email']: acc for acc in db_accounts}
-
-            # 获取分组列表
-            all_groups = get_group_list() or []
-            group_names = {}
-            for g in all_groups:
-                gid = g.get('id')
-                title = g.get('title', '')
-                # 清理不可显示字符
-                clean_title = ''.join(c for c in str(title) if c.isprintable())
-                if not clean_title or '\ufffd' in clean_title:
-                    clean_title = f"分组 {gid}"
-                group_names[gid] = clean_title
-            group_names[0] = "未分组"
-            group_names[1] = "默认分组"  # 确保默认分组存在
-
-            # 获取浏览器列表
-            browsers = get_browser_list(page=1, limit=1000) or []
-
-            # 按分组组织浏览器
-            grouped = {gid: [] for gid in group_names.keys()}
-            for browser in browsers:
-                gid = browser.get('group_id', 0) or 0
-                if gid not in grouped:
-                    grouped[gid] = []
-                    # 从浏览器数据获取分组名
-                    gname = browser.get('group_name', '') or ''
-                    clean_gname = ''.join(c for c in str(gname) if c.isprintable())
-                    if not clean_gname or '\ufffd' in clean_gname:
-                        clean_gname = f"分组 {gid}"
-                    group_names[gid] = clean_gname
-
-                browser_id = browser.get('id', '') or browser.get('profile_id', '')
-                browser_name = browser.get('name', '')
-
-                # 从名称或备注中提取邮箱
-                email = browser_name
-                note = browser.get('note', '') or ''
-                if '----' in note:
-                    email = note.split('----')[0].strip()
-                elif '----' in browser_name:
-                    email = browser_name.split('----')[0].strip()
-
-                if '@' not in email:
-                    continue
-
-                # 获取对应的账号信息
-                account = account_map.get(email, {})
-                account_data = {
-                    'browser_id': str(browser_id),
-                    'email': email,
-                    'password': account.get('password', ''),
-                    'secret': account.get('secret', '') or account.get('secret_key', ''),
-                }
-                grouped[gid].append(account_data)
-
-            # 创建树形结构
-            total_count = 0
-            modified_count = 0
-            for gid in sorted(grouped.keys()):
-                account_list = grouped[gid]
-                if not account_list:
-                    continue  # 跳过空分组
-
-                group_name = group_names.get(gid, f"分组 {gid}")
-
+            group_item = self._group_item_by_gid.get(gid)
+            if group_item is None:
                 # 分组节点
-                group_item = QTreeWidgetItem(self.tree)
+                group_item = QTreeWidgetItem()
                 group_item.setText(0, "")
-                group_item.setText(1, f"📁 {group_name} ({len(account_list)})")
                 group_item.setFlags(
                     group_item.flags() |
                     Qt.ItemFlag.ItemIsAutoTristate |
                     Qt.ItemFlag.ItemIsUserCheckable
                 )
                 group_item.setCheckState(0, Qt.CheckState.Unchecked)
-                group_item.setExpanded(True)
-                group_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "group", "id": gid})
+                group_item.setData(0, Qt.ItemDataRole.UserRole, gid)
 
                 # 设置分组行样式
                 font = group_item.font(1)
                 font.setBold(True)
                 group_item.setFont(1, font)
 
-                # 账号子节点
-                for account in account_list:
-                    child = QTreeWidgetItem(group_item)
-                    child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                    child.setCheckState(0, Qt.CheckState.Unchecked)  # 默认不选中
-                    child.setText(1, account["email"])
-                    child.setText(2, account["browser_id"])
-
-                    # 检查是否已修改过
-                    email = account["email"]
-                    if email in self.modification_history:
-                        history = self.modification_history[email]
-                        child.setText(3, "已修改")
-                        # 显示修改的手机号
-                        child.setText(4, f"→ {history['new_phone']}")
-
-                        # 设置置灰样式
-                        gray_color = QColor(150, 150, 150)
-                        gray_brush = QBrush(gray_color)
-                        for col in range(5):
-                            child.setForeground(col, gray_brush)
-
-                        modified_count += 1
-                    else:
-                        child.setText(3, "待处理")
-                        child.setText(4, "")
-
-                    child.setData(0, Qt.ItemDataRole.UserRole, {
-                        "type": "browser",
-                        "account": account
-                    })
-                    self.accounts.append(account)
-                    total_count += 1
-
-            self._update_selection_count()
-            self._log(f"已加载 {total_count} 个账号（已修改: {modified_count} 个）")
+                self.tree.addTopLevelItem(group_item)
+                # 展开状态需在节点挂到树上之后设置
+                group_item.setExpanded(True)
+                self._group_item_by_gid[gid] = group_item
+
+            # 账号子节点（显示文本已由加载线程准备好）
+            checkable = Qt.ItemFlag.ItemIsUserCheckable
+            unchecked = Qt.CheckState.Unchecked
+            user_role = Qt.ItemDataRole.UserRole
+            children = []
+            for account, status_text, message, modified in account_list:
+                browser_id = account.browser_id
+
+                child = QTreeWidgetItem(["", account.email, browser_id, status_text, message])
+                child.setFlags(child.flags() | checkable)
+                child.setCheckState(0, unchecked)  # 默认不选中
+
+                # 已修改过的账号置灰
+                if modified:
+                    for col in range(5):
+                        child.setForeground(col, _GRAY_BRUSH)
+                    self._modified_count += 1
+
+                child.setData(0, user_role, browser_id)
+                self._id_to_account[browser_id] = account
+                self._browser_id_to_item[browser_id] = child
+                children.append(child)
+
+            group_item.addChildren(children)
+            group_item.setText(1, f"📁 {group_name} ({group_item.childCount()})")
 
         except Exception as e:
-            self._log(f"❌ 加载账号失败: {e}")
+            self._log(f"❌ 显示账号失败: {e}")
             traceback.print_exc()
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+    def _on_load_finished(self):
+        """账号加载完成"""
+        self.load_worker.wait()
+        self.load_worker = None
+        self.refresh_btn.setEnabled(True)
+        self._update_selection_count()
+        self._log(f"已加载 {len(self._id_to_account)} 个账号（已修改: {self._modified_count} 个）")
 
     def _select_all(self):
-        """全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Checked)
+        """全选（屏蔽逐项信号，已选集合一次性设置）"""
+        self._set_all_checked(Qt.CheckState.Checked)
+        self._selected_ids = set(self._browser_id_to_item)
         self._update_selection_count()
 
     def _deselect_all(self):
         """取消全选"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            group_item.setCheckState(0, Qt.CheckState.Unchecked)
+        self._set_all_checked(Qt.CheckState.Unchecked)
+        self._selected_ids = set()
+        self._update_selection_count()
+
+    def _set_all_checked(self, state: Qt.CheckState):
+        """设置全部分组节点的勾选状态（自动三态会同步到子节点）"""
+        self.tree.blockSignals(True)
+        try:
+            root = self.tree.invisibleRootItem()
+            for i in range(root.childCount()):
+                root.child(i).setCheckState(0, state)
+        finally:
+            self.tree.blockSignals(False)
+
+    def _on_item_changed(self, item: QTreeWidgetItem, column: int):
+        """勾选状态变化时增量维护已选集合"""
+        if column != 0 or item.parent() is None:
+            return  # 只处理账号节点的勾选列
+        browser_id = item.text(2)
+        if item.checkState(0) == Qt.CheckState.Checked:
+            self._selected_ids.add(browser_id)
+        else:
+            self._selected_ids.discard(browser_id)
         self._update_selection_count()
 
     def _update_selection_count(self):
         """更新选中数量"""
-        count = 0
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    count += 1
-        self.selected_label.setText(f"已选择: {count} 个账号")
-
-    def _get_selected_accounts(self) -> list[dict]:
-        """获取选中的账号列表"""
-        selected = []
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    data = child.data(0, Qt.ItemDataRole.UserRole)
-                    if data and data.get("type") == "browser":
-                        selected.append(data.get("account"))
-        return selected
+        self.selected_label.setText(f"已选择: {len(self._selected_ids)} 个账号")
+
+    def _get_selected_accounts(self) -> list[AccountRow]:
+        """获取选中的账号列表（保持树中顺序，直接引用已加载的账号数据）"""
+        selected_ids = self._selected_ids
+        return [acc for browser_id, acc in self._id_to_account.items() if browser_id in selected_ids]
 
     def _log(self, message: str):
-        self.log_text.append(message)
+        """添加日志（缓冲后定时批量刷新）"""
+        self._log_buffer.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """将缓冲的日志一次性写入日志框"""
+        if not self._log_buffer:
+            return
+        self.log_text.append("\n".join(self._log_buffer))
+        self._log_buffer.clear()
         self.log_text.ensureCursorVisible()
 
     def _get_ai_config(self) -> dict:
-        """从全局配置获取 AI 配置"""
-        return {
-            'api_key': ConfigManager.get_ai_api_key() or None,
-            'base_url': ConfigManager.get_ai_base_url() or None,
-            'model': ConfigManager.get_ai_model(),
-            'max_steps': ConfigManager.get_ai_max_steps(),
-        }
+        """从全局配置获取 AI 配置（缓存，窗口重新显示时刷新）"""
+        if self._ai_config_cache is None:
+            self._ai_config_cache = {
+                'api_key': ConfigManager.get_ai_api_key() or None,
+                'base_url': ConfigManager.get_ai_base_url() or None,
+                'model': ConfigManager.get_ai_model(),
+                'max_steps': ConfigManager.get_ai_max_steps(),
+            }
+        return self._ai_config_cache
+
+    def showEvent(self, event):
+        """窗口显示时使 AI 配置缓存失效（可能已在配置管理中修改）"""
+        self._ai_config_cache = None
+        super().showEvent(event)
 
     def _start_process(self):
         """开始执行"""
@@ -470,14 +636,10 @@ class ReplacePhoneWindow(QDialog):
         self.current_new_phone = new_phone
 
         # 重置状态
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    child.setText(3, "等待中")
-                    child.setText(4, "")
+        for browser_id in self._selected_ids:
+            child = self._browser_id_to_item[browser_id]
+            child.setText(3, "等待中")
+            child.setText(4, "")
 
         # 获取 AI 配置
         ai_config = self._get_ai_config()
@@ -496,6 +658,7 @@ class ReplacePhoneWindow(QDialog):
         self.worker.progress_signal.connect(self._on_progress)
         self.worker.finished_signal.connect(self._on_finished)
         self.worker.log_signal.connect(self._log)
+        self._history_timer.start()
 
         # 更新 UI 状态
         self.start_btn.setEnabled(False)
@@ -513,41 +676,41 @@ class ReplacePhoneWindow(QDialog):
 
     def _on_progress(self, browser_id: str, status: str, message: str):
         """处理进度更新"""
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            group_item = root.child(i)
-            for j in range(group_item.childCount()):
-                child = group_item.child(j)
-                if child.text(2) == browser_id:
-                    child.setText(3, status)
-                    child.setText(4, message)
-
-                    # 根据状态设置颜色
-                    if status == "成功":
-                        child.setBackground(3, Qt.GlobalColor.green)
-
-                        # 保存修改记录到数据库
-                        data = child.data(0, Qt.ItemDataRole.UserRole)
-                        if data and data.get("type") == "browser":
-                            email = data.get("account", {}).get("email", "")
-                            if email and self.current_new_phone:
-                                self.db_manager.add_phone_modification(email, self.current_new_phone)
-                                # 更新本地缓存
-                                self.modification_history[email] = {
-                                    'new_phone': self.current_new_phone,
-                                    'modified_at': 'now'
-                                }
-                                # 更新显示
-                                child.setText(4, f"→ {self.current_new_phone}")
-                                # 设置置灰样式（跳过状态列，保留绿色背景的可读性）
-                                gray_color = QColor(150, 150, 150)
-                                gray_brush = QBrush(gray_color)
-                                for col in [0, 1, 2, 4]:  # 跳过状态列(3)
-                                    child.setForeground(col, gray_brush)
-
-                    elif status == "失败" or status == "错误":
-                        child.setBackground(3, Qt.GlobalColor.red)
-                    return
+        child = self._browser_id_to_item.get(browser_id)
+        if child is None:
+            return
+
+        child.setText(3, status)
+        child.setText(4, message)
+
+        # 根据状态设置颜色
+        if status == "成功":
+            child.setBackground(3, _SUCCESS_BRUSH)
+
+            # 保存修改记录到数据库
+            email = self._id_to_account[browser_id].email
+            if email and self.current_new_phone:
+                self._pending_history.append((email, self.current_new_phone))
+                # 更新本地缓存
+                self.modification_history[email] = {
+                    'new_phone': self.current_new_phone,
+                    'modified_at': 'now'
+                }
+                # 更新显示
+                child.setText(4, f"→ {self.current_new_phone}")
+                # 设置置灰样式（跳过状态列，保留绿色背景的可读性）
+                for col in (0, 1, 2, 4):  # 跳过状态列(3)
+                    child.setForeground(col, _GRAY_BRUSH)
+
+        elif status == "失败" or status == "错误":
+            child.setBackground(3, _FAIL_BRUSH)
+
+    def _flush_history(self):
+        """将缓存的修改记录一次性写入数据库"""
+        if not self._pending_history:
+            return
+        records, self._pending_history = self._pending_history, []
+        self.db_manager.add_phone_modifications_batch(records)
 
     def _clear_modification_history(self):
         """清除已修改记录"""
@@ -565,16 +728,39 @@ class ReplacePhoneWindow(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # 清除数据库记录
+        # 清除数据库记录（先写入尚未落库的记录，避免清除后又被写回）
+        self._flush_history()
         deleted = self.db_manager.clear_phone_modification_history()
+        cleared = self.modification_history
         self.modification_history = {}
 
-        # 刷新列表
-        self._load_accounts()
+        # 原地重置已修改账号的显示，无需重新加载和重建整棵树
+        default_brush = QBrush()
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            for account in self._id_to_account.values():
+                if account.email not in cleared:
+                    continue
+                child = self._browser_id_to_item.get(account.browser_id)
+                if child is None:
+                    continue
+                child.setText(3, "待处理")
+                child.setText(4, "")
+                child.setBackground(3, default_brush)
+                for col in range(5):
+                    child.setForeground(col, default_brush)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
         self._log(f"✅ 已清除 {deleted} 条修改记录")
 
     def _on_finished(self):
         """处理完成"""
+        self._history_timer.stop()
+        self._flush_history()
+
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.phone_input.setEnabled(True)
@@ -584,9 +770,15 @@ class ReplacePhoneWindow(QDialog):
 
     def closeEvent(self, event):
         """关闭窗口时停止工作线程"""
+        # 账号加载线程不中断也不在界面线程上等待：窗口只是隐藏，
+        # 加载在后台完成，再次打开时账号树已完整
         if self.worker and self.worker.isRunning():
             self.worker.stop()
             self.worker.wait(3000)
+        self._history_timer.stop()
+        self._flush_history()
+        self._log_timer.stop()
+        self._flush_log()
         event.accept()
 
 
@@ -595,6 +787,20 @@ if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
 
     app = QApplication(sys.argv)
+
+    # python replace_phone_gui.py --profile：关闭窗口后输出界面线程耗时排行
+    profiler = None
+    if "--profile" in sys.argv:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     dialog = ReplacePhoneWindow()
     dialog.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+
+    if profiler is not None:
+        import pstats
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+    sys.exit(exit_code)